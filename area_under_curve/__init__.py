@@ -3,4 +3,13 @@
 __title__ = 'area_under_curve'
 
 from .area_under_curve import *
-
+from .caches import *
+from .stats import *
+from .steps import *
+from .batch import *
+from .cumulative import *
+from .solver import *
+from .samples import *
+from .arguments import *
+from .server import *
+from .cli import *
@@ -2,42 +2,159 @@
 """Find approximate area under curve:  Supports simpson, trapezoid, and
 midpoint algorithms,  n-degree single variable polynomials, and variable step size
 """
-import ast
-import getopt
+import hashlib
+import importlib
 import math
+import operator
+import os
+import re
 import sys
 import logging
-from dataclasses import dataclass
-
-LOGGER = logging.getLogger()
-LOGGER.setLevel(10)
-
-USAGE = """ -p|--poly {DegreeN1:CoefficientM1, DegreeN2:CoefficientM2, ...}
--l|--lower <lower_bound> -u|--upper <upper_bound> -s|--step <step> 
--a|--algorithm <simpson | trapezoid | midpoint>
-  defaults: step_size:1, lower_bound:0, upper_bound:10, algorithm:trapezoid
-
-e.g. To evaluate the area of y=x^2 + 2x -2 from [1-50] with .1 width sums and the midpoint algorithm:
- python area_under_curve.py --poly "{2:1, 1:2, 0:-2}" --lower 1 --upper 50 --step .1 --algorithm midpoint
-"""
-
-FULL_USAGE = USAGE
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from typing import Callable, Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TOLERANCE = 1e-9
+MAX_ADAPTIVE_DEPTH = 50
+MAX_ROMBERG_LEVELS = 25
+MIN_ROMBERG_LEVELS = 3
+DEFAULT_GAUSS_ORDER = 5
+MAX_GAUSS_ORDER = 64
+NEGATIVE_FRACTIONAL = "Fractional exponents not supported for negative inputs."
+
+# Common exponent denominators whose roots are cheaper than a log and exp per point
+ROOT_DENOMINATORS = (2, 3, 4, 6)
+cbrt = getattr(math, "cbrt", lambda x: x ** (1 / 3))
+
+# Gauss-Legendre nodes and weights on [-1, 1], keyed by order
+GAUSS_LEGENDRE_TABLE = {}
+
+# Registered algorithms by name, see register_algorithm
+ALGORITHMS = {}
+ALGORITHM_PROPERTIES = {"kernel", "panels", "weights", "composite", "adaptive", "closed_form",
+                        "samples", "points_per_panel", "shares_nodes", "exact_degree",
+                        "error_bound"}
 
 class Polynomial:
-    """Single variable polynomial class supporting n degrees"""
+    """Immutable single variable polynomial class supporting n degrees.  Terms are stored
+    as tuples of exponents, in increasing order, and their coefficients.
+    """
+    __slots__ = ("exponents", "coefficients", "fractional_exponents", "evaluator",
+                 "array_evaluator")
+    exponents: tuple
+    coefficients: tuple
+    fractional_exponents: bool
+    evaluator: Callable
+    array_evaluator: Optional[Callable]
+
     def __init__(self, coefficient_dict):
         """ The coefficient dict keys are the term orders, and the values are the coefficients
             e.g
             f(x) = 3x^2 would be expressed as {2:3}
             f(x) = 9x^5 + 3 would be {5:9, 0:3}
         """
-        self.fractional_exponents = False
-
-        self.coefficient_dict = coefficient_dict
         if any_negative(coefficient_dict):
             raise ValueError("Only positive exponents supported")
-
-        self.fractional_exponents = any_non_int_numbers(coefficient_dict)
+        exponents = tuple(sorted(coefficient_dict))
+        set_slot = super().__setattr__
+        set_slot("exponents", exponents)
+        set_slot("coefficients", tuple(coefficient_dict[degree] for degree in exponents))
+        set_slot("fractional_exponents", any_non_int_numbers(exponents))
+        evaluator, array_evaluator = self.compile_evaluator()
+        set_slot("evaluator", evaluator)
+        set_slot("array_evaluator", array_evaluator)
+
+    def __setattr__(self, name, value):
+        if name in Polynomial.__slots__:
+            raise AttributeError(f"Polynomial is immutable, can't set {name}")
+        super().__setattr__(name, value)
+
+    @property
+    def coefficient_dict(self):
+        """New dict of the coefficients keyed by term order"""
+        return dict(zip(self.exponents, self.coefficients))
+
+    def key(self):
+        """Canonical tuple of whether there are fractional exponents, since they restrict
+        the domain to x >= 0, followed by the non-zero (degree, coefficient) terms,
+        sorted by degree
+        """
+        return (self.fractional_exponents,) + tuple(
+            (float(degree), float(coefficient)) for degree, coefficient
+            in zip(self.exponents, self.coefficients) if coefficient != 0)
+
+    def __eq__(self, other):
+        if isinstance(other, Polynomial):
+            return self.key() == other.key()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __reduce__(self):
+        """Pickle from the coefficients only, the compiled evaluator is rebuilt"""
+        return (self.__class__, (self.coefficient_dict,))
+
+    def __add__(self, other):
+        """Sum with another polynomial or a constant"""
+        if isinstance(other, (int, float)):
+            other = Polynomial({0: other})
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        terms = self.coefficient_dict
+        for degree, coefficient in zip(other.exponents, other.coefficients):
+            terms[degree] = terms.get(degree, 0) + coefficient
+        return polynomial_from_terms(terms)
+
+    __radd__ = __add__
+
+    def __mul__(self, other):
+        """Product with another polynomial, or scaled by a constant"""
+        if isinstance(other, (int, float)):
+            return polynomial_from_terms({degree: coefficient * other for degree, coefficient
+                                          in zip(self.exponents, self.coefficients)})
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        terms = {}
+        for degree, coefficient in zip(self.exponents, self.coefficients):
+            for other_degree, other_coefficient in zip(other.exponents, other.coefficients):
+                product_degree = degree + other_degree
+                terms[product_degree] = (terms.get(product_degree, 0)
+                                         + coefficient * other_coefficient)
+        return polynomial_from_terms(terms)
+
+    __rmul__ = __mul__
+
+    def compile_evaluator(self):
+        """Compile the coefficients once into a pair of functions of x, for floats and
+        for numpy arrays (None without numpy).  Integer polynomials use one function for
+        both, see integer_evaluator.  Fractional exponents with a common
+        denominator in ROOT_DENOMINATORS become an integer polynomial in a sqrt/cbrt root
+        of x, any others share one log(x) per point.  Fractional evaluators reject negative
+        inputs as part of their x=0 special case, instead of in a separate check.
+        """
+        terms = [(degree, coefficient) for degree, coefficient
+                 in zip(reversed(self.exponents), reversed(self.coefficients))
+                 if coefficient != 0]
+        if not self.fractional_exponents:
+            evaluator = integer_evaluator(terms)
+            return evaluator, evaluator
+        array_evaluator = None if numpy is None else fractional_array_evaluator(terms)
+        return fractional_evaluator(terms), array_evaluator
+
+    def check_domain(self, lower_bound):
+        """Raise ValueError if the polynomial is undefined anywhere from lower_bound up"""
+        if self.fractional_exponents and lower_bound < 0:
+            raise ValueError(NEGATIVE_FRACTIONAL)
 
     def format_term(self, degree, value):
         """string format a single term"""
@@ -55,10 +172,8 @@ class Polynomial:
     def __str__(self):
         """string format the entire polynomial"""
         terms = []
-        degrees = list(self.coefficient_dict)
-        degrees = sorted(degrees, reverse=True)
-        for degree in degrees:
-            term_formatted = (self.format_term(degree, self.coefficient_dict[degree]))
+        for degree, coefficient in zip(reversed(self.exponents), reversed(self.coefficients)):
+            term_formatted = (self.format_term(degree, coefficient))
             if term_formatted:
                 terms.append(term_formatted)
         if not terms:
@@ -67,14 +182,30 @@ class Polynomial:
 
     def evaluate(self, value):
         """Evaluate the polynomial at a given value"""
-        total = 0
-        for degree in self.coefficient_dict:
-            coefficient = self.coefficient_dict[degree]
-            if self.fractional_exponents and value < 0:
-                raise ValueError("Fractional exponents not supported for negative inputs.")
-            current_term = math.pow(value, degree)* coefficient
-            total += current_term
-        return total
+        return self.evaluator(float(value))
+
+    def evaluate_array(self, values):
+        """Evaluate the polynomial at every value of a numpy array"""
+        return self.array_evaluator(values)
+
+    def antiderivative(self):
+        """Antiderivative polynomial with a zero constant term:  every term c*x^n
+        integrates to c/(n+1)*x^(n+1), fractional exponents included
+        """
+        return Polynomial({degree + 1: coefficient / (degree + 1)
+                           for degree, coefficient in zip(self.exponents, self.coefficients)})
+
+    def derivative(self):
+        """Derivative polynomial:  every term c*x^n differentiates to n*c*x^(n-1).  Raises
+        ValueError for exponents between 0 and 1, whose derivatives have negative exponents.
+        """
+        return polynomial_from_terms({degree - 1: degree * coefficient for degree, coefficient
+                                      in zip(self.exponents, self.coefficients) if degree != 0})
+
+    def integrate(self, lower, upper):
+        """Exact area under the polynomial between lower and upper"""
+        antiderivative = self.antiderivative()
+        return antiderivative.evaluate(upper) - antiderivative.evaluate(lower)
 
 class Bounds:
     """Range of values class"""
@@ -88,47 +219,102 @@ class Bounds:
             raise ValueError("invalid bounds")
         self.full_range = self.float_range(lower_bound, upper_bound, step_size)
 
+    def key(self):
+        """Canonical tuple of the lower bound, upper bound, and step size"""
+        return (float(self.lower_bound), float(self.upper_bound), float(self.step_size))
+
     def __str__(self):
         return f"Bounds: [{self.lower_bound} - {self.upper_bound}], step_size: {self.step_size}"
 
     def float_range(self, lower_bound, upper_bound, step_size):
-        """Create range of floats"""
-        float_list = []
-        current = lower_bound
-        float_list.append(current)
+        """Create lazy range of floats"""
         # Final number should be almost equal to upper bound.
         # Adding fraction of step_size offset to account for rounding errors.
-        while current + step_size < (upper_bound + (step_size * .1)):
-            current += step_size
-            float_list.append(current)
-        return float_list
-
-@dataclass
-class Parameters:
-    """Contains several groups of parameters"""
-    polynomial: Polynomial
-    bounds: Bounds
-    algorithm: str
-
-    @classmethod
-    def factory(cls, polynomial_coefficients, #pylint: disable=too-many-arguments
-                lower, upper, step, algorithm):
-        """Create parameters object from polynomial, bounds, and algorithm parameters"""
-        bounds = Bounds(lower, upper, step)
-        polynomial = Polynomial(polynomial_coefficients)
-        return cls(polynomial, bounds, algorithm)
+        count = math.floor((upper_bound - lower_bound) / step_size + .1) + 1
+        return FloatRange(lower_bound, step_size, count)
 
+class FloatRange(Sequence):
+    """Lazy, evenly spaced range of floats.  Point i is computed as
+    origin + (start + i*stride)*step on demand, so no list is materialized, repeated
+    addition can't drift, and slices produce exactly the same values as the full range.
+    """
+    def __init__(self, origin, step, count, start=0, stride=1): # pylint: disable=too-many-arguments
+        self.origin = origin
+        self.base_step = step
+        self.count = max(count, 0)
+        self.start = start
+        self.stride = stride
+
+    @property
+    def lower(self):
+        """First point of the range"""
+        return self.origin + self.start * self.base_step
+
+    @property
+    def step(self):
+        """Spacing between consecutive points"""
+        return self.base_step * self.stride
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, stride = index.indices(self.count)
+            return FloatRange(self.origin, self.base_step, len(range(start, stop, stride)),
+                              self.start + start * self.stride, self.stride * stride)
+        index = operator.index(index)
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("FloatRange index out of range")
+        return self.origin + (self.start + index * self.stride) * self.base_step
+
+    def __iter__(self):
+        origin = self.origin
+        step = self.base_step
+        for index in range(self.start, self.start + self.count * self.stride, self.stride):
+            yield origin + index * step
+
+    def key(self):
+        """Tuple of the values that define the range"""
+        return (self.origin, self.base_step, self.count, self.start, self.stride)
+
+    def __eq__(self, other):
+        if isinstance(other, FloatRange):
+            return self.key() == other.key()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"FloatRange{self.key()}"
+
+    def to_array(self):
+        """Materialize the range as a numpy array"""
+        indexes = numpy.arange(self.start, self.start + self.count * self.stride, self.stride,
+                               dtype=float)
+        return self.origin + indexes * self.base_step
+
+    def chunks(self, size):
+        """Yield consecutive sub-ranges of at most size points.  Neighboring chunks
+        share their boundary point so each one can be integrated on its own.
+        """
+        if size < 2:
+            raise ValueError("chunk size must be >= 2")
+        start = 0
+        while start < self.count - 1:
+            stop = min(start + size, self.count)
+            yield self[start:stop]
+            start = stop - 1
 
 # Misc helper functions
 
-def is_number(string):
-    """Simple check to see if string is valid number"""
-    try:
-        float(string)
-        return True
-    except ValueError as err:
-        LOGGER.error(f"Error: {string} {str(err)}")
-        return False
+def polynomial_from_terms(terms):
+    """Polynomial from a dict of computed terms, dropping the ones that cancelled out"""
+    return Polynomial({degree: coefficient for degree, coefficient in terms.items()
+                       if coefficient != 0})
 
 def any_non_int_numbers(collection):
     """Returns true if any numbers in the collection are not integers"""
@@ -138,105 +324,307 @@ def any_negative(collection):
     """Returns true if any numbers in the collection are < 0"""
     return any(map(lambda n: n < 0, collection))
 
-def has_property(name):
-    """Simple function property decorator"""
+def register_algorithm(name=None, **properties):
+    """Decorator that registers a per-panel algorithm function(poly, lower, upper) with
+    get_algorithm under name (the function name by default).  Optional properties:
+      kernel(poly, points) -> summed area over a numpy array of grid points
+      panels(poly, points) -> numpy array of each panel's area over an array of grid points
+      weights(points) -> numpy arrays of (nodes, weights) over a FloatRange of grid points
+      composite(poly, points) -> summed area over a FloatRange, evaluating each node once
+      adaptive(poly, lower, upper, tolerance) -> (area, evaluations), ignoring the grid
+      closed_form=True if the function integrates [lower, upper] exactly, ignoring the grid
+      samples(x, y) -> area under numpy arrays of tabulated samples, for area_under_samples
+      points_per_panel, shares_nodes, exact_degree:  evaluations per panel, whether
+        neighboring panels share nodes, and the highest polynomial degree integrated exactly
+      error_bound=(order, constant) if the error over [lower, upper] is at most
+        constant * (upper - lower) * step^order * max|f^(order)|, for auto_step
+    area_under_curve uses the fastest of these the algorithm has.
+    """
+    unknown = set(properties) - ALGORITHM_PROPERTIES
+    if unknown:
+        raise ValueError(f"Unknown algorithm properties: {', '.join(sorted(unknown))}")
     def wrap(func):
         """Wrapper function"""
-        setattr(func, name, True)
+        func.algorithm = True
+        for key, value in properties.items():
+            setattr(func, key, value)
+        ALGORITHMS[name or func.__name__] = func
         return func
     return wrap
 
-# Argument parsing
-def parse_commandline_arguments(argv): # pylint: disable=too-many-return-statements,too-many-branches
-    """Parse command line arguments and return a parameters
-    object with Bounds, Polynomial, and Algorithm
+def integer_evaluator(terms):
+    """Build an evaluator from integer (degree, coefficient) pairs, highest degree first.
+    Dense polynomials use Horner's scheme, sparse ones use Horner over the gaps between
+    degrees with each distinct power of x computed once per call.  The function works on
+    floats and numpy arrays alike.
     """
-    #defaults
-    lower = 0
-    upper = 10
-    step_size = 1
-    algorithm = "trapezoid"
-    polynomial_coefficients = {}
-    try:
-        opts, _ = getopt.getopt(argv, "hl:u:s:a:p:",
-                                ["lower=", "upper=", "step=",
-                                 "algorithm=", "polynomial=", "help"])
-
-        non_numerical_params = ["-a", "--algorithm", "-p", "--polynomial", "-h", "--help"]
-        numerical_params = list(filter(lambda t: t[0] not in non_numerical_params, opts))
-        if any(map(lambda n: not is_number(n[1]), numerical_params)):
-            logging.error("Error in numerical arguments.")
-            return None
-    except getopt.GetoptError as err:
-        LOGGER.error(f"Option error: {str(err)}")
-        return None
-    for opt, arg in opts:
-        if opt in ("-h", "--help"):
-            LOGGER.info(FULL_USAGE)
-            sys.exit(0)
-        elif opt in ("-l", "--lower"):
-            lower = float(arg)
-        elif opt in ("-u", "--upper"):
-            upper = float(arg)
-        elif opt in ("-s", "--step"):
-            step_size = float(arg)
-        elif opt in ("-a", "--algorithm"):
-            algorithm = arg
-        elif opt in ("-p", "--polynomial"):
-            polynomial_coefficients = parse_polynomial_coefficients(arg)
-        if step_size <= 0:
-            LOGGER.error(f"step size must be > 0: {step_size}")
-            return None
-        if lower >= upper:
-            LOGGER.error(f"invalid bounds: {lower} {upper}")
-            return None
-        if (lower < 0 or upper < 0) and any_non_int_numbers(polynomial_coefficients):
-            LOGGER.error("Fractional exponents not supported for negative values.")
+    if not terms:
+        return lambda x: x * 0.0
+    degree = terms[0][0]
+    if degree == 0:
+        constant = terms[0][1]
+        return lambda x: x * 0.0 + constant
+    if 2 * len(terms) > degree:
+        return horner_evaluator(terms)
+    return sparse_horner_evaluator(terms)
+
+def common_denominator(terms):
+    """Common denominator from ROOT_DENOMINATORS of the degrees of (degree, coefficient)
+    pairs, or None if there isn't one
+    """
+    denominator = 1
+    for degree, _ in terms:
+        fraction = Fraction(degree).limit_denominator(max(ROOT_DENOMINATORS))
+        if float(fraction) != degree:
             return None
-    algorithm_function = get_algorithm(algorithm)
-    if not algorithm_function:
-        LOGGER.error(f"Algorithm : {algorithm} not found!")
-        return None
-    if not polynomial_coefficients:
-        LOGGER.error("Polynomial not specified or invalid")
-        return None
-    if any_negative(polynomial_coefficients):
-        LOGGER.error("Only positive exponents supported")
-        return None
-    return Parameters.factory(polynomial_coefficients,
-                              lower, upper, step_size, algorithm_function)
-
-
-def parse_polynomial_coefficients(dict_literal):
-    """Try to parse string into dictionary, return None on failure"""
-    coefficient_dict = {}
-    try:
-        coefficient_dict = ast.literal_eval(dict_literal)
-    except SyntaxError as errs:
-        LOGGER.error(f"Syntax Error parsing polynomial args: {dict_literal} {str(errs)}")
-    except ValueError as errv:
-        logging.error(f"Value Error parsing polynomial args: {dict_literal} {str(errv)}")
-        return None
-    if not isinstance(coefficient_dict, dict):
-        LOGGER.error(f"Malformed dictionary: {coefficient_dict}")
-        return None
-    return coefficient_dict
+        denominator = denominator * fraction.denominator // math.gcd(denominator,
+                                                                      fraction.denominator)
+    return denominator if denominator in ROOT_DENOMINATORS else None
+
+def root_power_sum(terms, denominator, root):
+    """Build a function of x from fractional (degree, coefficient) pairs whose degrees are
+    multiples of 1/denominator.  Each x^(n/d) is split into x^(n//d) * root(x)^(n%d), so
+    the terms become one integer polynomial in x per remainder, e.g. 2x^1.5 + x^.5 + 3
+    is 3 + sqrt(x) * (2x + 1).
+    """
+    remainders = {}
+    for degree, coefficient in terms:
+        quotient, remainder = divmod(round(degree * denominator), denominator)
+        remainders.setdefault(remainder, []).append((quotient, coefficient))
+    parts = [(remainder, integer_evaluator(integer_terms))
+             for remainder, integer_terms in sorted(remainders.items())]
+    def power_sum(x):
+        root_x = root(x)
+        total = 0.0
+        for remainder, integer in parts:
+            total = total + root_x ** remainder * integer(x)
+        return total
+    return power_sum
+
+def fractional_evaluator(terms):
+    """Build a float evaluator from fractional (degree, coefficient) pairs"""
+    constant = sum(coefficient for degree, coefficient in terms if degree == 0)
+    denominator = common_denominator(terms)
+    if denominator is not None:
+        root = {2: math.sqrt, 3: cbrt, 4: lambda x: math.sqrt(math.sqrt(x)),
+                6: lambda x: cbrt(math.sqrt(x))}[denominator]
+        power_sum = root_power_sum(terms, denominator, root)
+    else:
+        powers = [(degree, coefficient) for degree, coefficient in terms if degree != 0]
+        def power_sum(x):
+            log_x = math.log(x)
+            return constant + sum(coefficient * math.exp(degree * log_x)
+                                  for degree, coefficient in powers)
+    def evaluate(x):
+        if x > 0:
+            return power_sum(x)
+        if x == 0:
+            return constant
+        raise ValueError(NEGATIVE_FRACTIONAL)
+    return evaluate
+
+def fractional_array_evaluator(terms):
+    """Build a numpy array evaluator from fractional (degree, coefficient) pairs.  The
+    roots used all produce NaN for negative inputs, which numpy is told to raise on.
+    """
+    denominator = common_denominator(terms)
+    if denominator is not None:
+        root = {2: numpy.sqrt, 4: lambda x: numpy.sqrt(numpy.sqrt(x)),
+                6: lambda x: numpy.cbrt(numpy.sqrt(x))}.get(
+                    denominator, lambda x: numpy.exp(numpy.log(x) / denominator))
+        power_sum = root_power_sum(terms, denominator, root)
+    else:
+        constant = sum(coefficient for degree, coefficient in terms if degree == 0)
+        powers = [(degree, coefficient) for degree, coefficient in terms if degree != 0]
+        def power_sum(x):
+            log_x = numpy.log(x)
+            total = x * 0.0 + constant
+            for degree, coefficient in powers:
+                total += coefficient * numpy.exp(degree * log_x)
+            return total
+    def evaluate(values):
+        with numpy.errstate(divide="ignore", invalid="raise"):
+            try:
+                return power_sum(values)
+            except FloatingPointError as err:
+                raise ValueError(NEGATIVE_FRACTIONAL) from err
+    return evaluate
+
+def horner_evaluator(terms):
+    """Build a Horner's scheme evaluator from (degree, coefficient) pairs, highest degree first"""
+    coefficient_by_degree = dict(terms)
+    leading, *rest = [coefficient_by_degree.get(degree, 0)
+                      for degree in range(terms[0][0], -1, -1)]
+    def evaluate(x):
+        total = leading
+        for coefficient in rest:
+            total = total * x + coefficient
+        return total
+    return evaluate
+
+def sparse_horner_evaluator(terms):
+    """Build a Horner's scheme evaluator that steps over the gaps between the degrees of
+    (degree, coefficient) pairs, highest degree first, e.g. x^1000 + 3x^999 + 2 becomes
+    (x + 3) * x^999 + 2
+    """
+    leading = terms[0][1]
+    steps = [(higher[0] - lower[0], lower[1]) for higher, lower in zip(terms, terms[1:])]
+    trailing_degree = terms[-1][0]
+    gaps = sorted({gap for gap, _ in steps} | ({trailing_degree} - {0}))
+    def evaluate(x):
+        powers = {gap: x ** gap for gap in gaps}
+        total = leading
+        for gap, coefficient in steps:
+            total = total * powers[gap] + coefficient
+        if trailing_degree:
+            total = total * powers[trailing_degree]
+        return total
+    return evaluate
+
+# Vectorized panels and kernels:  each one takes an array of grid points and returns
+# the area of every panel between them, or their sum.
+def midpoint_panels(poly, points):
+    """Midpoint slices over an array of grid points"""
+    widths = numpy.diff(points)
+    values = poly.evaluate_array((points[:-1] + points[1:]) / 2.0)
+    return widths * values
+
+def midpoint_kernel(poly, points):
+    """Sum midpoint slices over an array of grid points"""
+    return numpy.sum(midpoint_panels(poly, points))
+
+def trapezoid_panels(poly, points):
+    """Trapezoid slices over an array of grid points"""
+    widths = numpy.diff(points)
+    values = poly.evaluate_array(points)
+    return widths * (values[:-1] + values[1:]) / 2.0
+
+def trapezoid_kernel(poly, points):
+    """Sum trapezoid slices over an array of grid points"""
+    return numpy.sum(trapezoid_panels(poly, points))
+
+def simpson_panels(poly, points):
+    """Parabola (Simpson) slices over an array of grid points"""
+    widths = numpy.diff(points)
+    values = poly.evaluate_array(points)
+    midpoint_values = poly.evaluate_array((points[:-1] + points[1:]) / 2.0)
+    return widths * (values[:-1] + 4 * midpoint_values + values[1:]) / 6.0
+
+def simpson_kernel(poly, points):
+    """Sum parabola (Simpson) slices over an array of grid points"""
+    return numpy.sum(simpson_panels(poly, points))
+
+# Quadrature weights:  each one takes a FloatRange of grid points and returns numpy
+# arrays of the nodes the rule evaluates and the weight of each node, so that the
+# area is sum(weights * f(nodes)).  Ranges that share a boundary point add up.
+def midpoint_weights(points):
+    """Midpoint nodes and weights over a range of grid points"""
+    nodes = points[:-1].to_array() + points.step / 2.0
+    return nodes, numpy.full(len(nodes), float(points.step))
+
+def trapezoid_weights(points):
+    """Trapezoid nodes and weights (1,2,...,2,1) * step/2 over a range of grid points"""
+    if len(points) < 2:
+        return numpy.zeros(0), numpy.zeros(0)
+    weights = numpy.full(len(points), float(points.step))
+    weights[[0, -1]] /= 2.0
+    return points.to_array(), weights
+
+def simpson_weights(points):
+    """Simpson nodes and weights (1,4,2,4,...,4,1) * step/6 over a range of grid points
+    and panel midpoints
+    """
+    if len(points) < 2:
+        return numpy.zeros(0), numpy.zeros(0)
+    nodes = FloatRange(points.origin, points.base_step / 2.0, 2 * len(points) - 1,
+                       2 * points.start, points.stride).to_array()
+    weights = numpy.full(len(nodes), 2.0)
+    weights[1::2] = 4.0
+    weights[[0, -1]] = 1.0
+    return nodes, weights * (points.step / 6.0)
+
+# Composite rules:  each one takes an evenly spaced FloatRange of grid points,
+# evaluates every node exactly once and applies the rule's weights.
+def midpoint_composite(poly, points):
+    """Sum midpoint slices over a range of grid points"""
+    evaluate = poly.evaluate
+    half_step = points.step / 2.0
+    return points.step * math.fsum(evaluate(x + half_step) for x in points[:-1])
+
+def trapezoid_composite(poly, points):
+    """Sum trapezoid slices over a range of grid points with weights 1,2,...,2,1"""
+    if len(points) < 2:
+        return 0
+    evaluate = poly.evaluate
+    ends = evaluate(points[0]) + evaluate(points[-1])
+    interior = math.fsum(evaluate(x) for x in points[1:-1])
+    return points.step * (ends + 2 * interior) / 2.0
+
+def simpson_composite(poly, points):
+    """Sum parabola (Simpson) slices over a range of grid points with weights
+    1,4,2,4,...,4,1 on the grid points and panel midpoints
+    """
+    if len(points) < 2:
+        return 0
+    evaluate = poly.evaluate
+    half_step = points.step / 2.0
+    ends = evaluate(points[0]) + evaluate(points[-1])
+    interior = math.fsum(evaluate(x) for x in points[1:-1])
+    midpoints = math.fsum(evaluate(x + half_step) for x in points[:-1])
+    return points.step * (ends + 2 * interior + 4 * midpoints) / 6.0
+
+# Sample rules:  each one takes numpy arrays of tabulated x and y values, with x
+# increasing but not necessarily evenly spaced, and returns the area under them.
+def trapezoid_samples(x, y):
+    """Sum trapezoids between consecutive samples"""
+    return float(numpy.sum(numpy.diff(x) * (y[:-1] + y[1:]))) / 2.0
+
+def simpson_samples(x, y):
+    """Sum parabolas through consecutive pairs of intervals of uneven width.  An odd
+    interval count gets its last interval from the parabola through the last three
+    samples, and a lone interval falls back to a trapezoid.
+    """
+    intervals = len(x) - 1
+    if intervals < 2:
+        return trapezoid_samples(x, y)
+    pairs = 2 * (intervals // 2)
+    h0 = x[1:pairs:2] - x[0:pairs - 1:2]
+    h1 = x[2:pairs + 1:2] - x[1:pairs:2]
+    area = float(numpy.sum((h0 + h1) / 6.0 * ((2.0 - h1 / h0) * y[0:pairs - 1:2]
+                                              + (h0 + h1) ** 2 / (h0 * h1) * y[1:pairs:2]
+                                              + (2.0 - h0 / h1) * y[2:pairs + 1:2])))
+    if intervals % 2:
+        h0 = x[-2] - x[-3]
+        h1 = x[-1] - x[-2]
+        area += float((2 * h1 ** 2 + 3 * h0 * h1) / (6 * (h0 + h1)) * y[-1]
+                      + (h1 ** 2 + 3 * h0 * h1) / (6 * h0) * y[-2]
+                      - h1 ** 3 / (6 * h0 * (h0 + h1)) * y[-3])
+    return area
 
 # Algorithms and utilities
-@has_property("algorithm")
+@register_algorithm(kernel=midpoint_kernel, panels=midpoint_panels, weights=midpoint_weights,
+                    composite=midpoint_composite,
+                    points_per_panel=1, shares_nodes=False, exact_degree=1,
+                    error_bound=(2, 1 / 24))
 def midpoint(poly, lower, upper):
     """Calculate midpoint slice from two polynomial evaluations and step size"""
     value = poly.evaluate((upper+lower)/2.0)
     return (upper - lower) * value
 
-@has_property("algorithm")
+@register_algorithm(kernel=trapezoid_kernel, panels=trapezoid_panels, weights=trapezoid_weights,
+                    composite=trapezoid_composite,
+                    samples=trapezoid_samples, points_per_panel=2, shares_nodes=True,
+                    exact_degree=1, error_bound=(2, 1 / 12))
 def trapezoid(poly, lower, upper):
     """Calculate trapezoid slice from two polynomial evaluations and step size"""
     lower_value = poly.evaluate(lower)
     upper_value = poly.evaluate(upper)
     return (upper - lower) * ((lower_value + upper_value)/2.0)
 
-@has_property("algorithm")
+@register_algorithm(kernel=simpson_kernel, panels=simpson_panels, weights=simpson_weights,
+                    composite=simpson_composite,
+                    samples=simpson_samples, points_per_panel=3, shares_nodes=True,
+                    exact_degree=3, error_bound=(4, 1 / 2880))
 def simpson(poly, lower, upper):
     """Calculate parabola (Simpson) slice from two polynomial evaluations and step size"""
     lower_value = poly.evaluate(lower)
@@ -244,42 +632,357 @@ def simpson(poly, lower, upper):
     midpoint_value = poly.evaluate((lower+upper)/2.0)
     return ((upper - lower) / 6.0) * (lower_value + 4 * midpoint_value + upper_value)
 
+def adaptive_simpson(poly, lower, upper, tolerance=DEFAULT_TOLERANCE,
+                     max_depth=MAX_ADAPTIVE_DEPTH):
+    """Adaptive Simpson quadrature:  recursively split only the halves whose Simpson
+    error estimate is above their share of the tolerance, passing already computed
+    function values down so each point is evaluated once.  Tolerances below what floating
+    point precision can resolve, relative to a first estimate of the area under |f|,
+    are raised to that precision.
+    Returns a tuple of (area, number of polynomial evaluations)
+    """
+    evaluate = poly.evaluate
+    evaluations = 0
+
+    def refine(lower, upper, values, whole, tolerance, depth): # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-locals
+        nonlocal evaluations
+        lower_value, midpoint_value, upper_value = values
+        middle = (lower + upper) / 2.0
+        left_value = evaluate((lower + middle) / 2.0)
+        right_value = evaluate((middle + upper) / 2.0)
+        evaluations += 2
+        left = ((middle - lower) / 6.0) * (lower_value + 4 * left_value + midpoint_value)
+        right = ((upper - middle) / 6.0) * (midpoint_value + 4 * right_value + upper_value)
+        delta = left + right - whole
+        if depth <= 0 or abs(delta) <= 15 * max(tolerance, precision):
+            return left + right + delta / 15.0
+        return (refine(lower, middle, (lower_value, left_value, midpoint_value),
+                       left, tolerance / 2.0, depth - 1) +
+                refine(middle, upper, (midpoint_value, right_value, upper_value),
+                       right, tolerance / 2.0, depth - 1))
+
+    values = (evaluate(lower), evaluate((lower + upper) / 2.0), evaluate(upper))
+    evaluations += 3
+    whole = ((upper - lower) / 6.0) * (values[0] + 4 * values[1] + values[2])
+    precision = 8 * sys.float_info.epsilon * abs((upper - lower) / 6.0) * (
+        abs(values[0]) + 4 * abs(values[1]) + abs(values[2]))
+    area = refine(lower, upper, values, whole, tolerance, max_depth)
+    return area, evaluations
+
+@register_algorithm(adaptive=adaptive_simpson, exact_degree=3)
+def adaptive(poly, lower, upper):
+    """Calculate slice with adaptive Simpson quadrature to the default tolerance"""
+    return adaptive_simpson(poly, lower, upper)[0]
+
+def romberg_tableau(poly, lower, upper, tolerance=DEFAULT_TOLERANCE, #pylint: disable=too-many-locals
+                    max_levels=MAX_ROMBERG_LEVELS):
+    """Romberg integration:  row k of the tableau starts with the trapezoid estimate on
+    2^k panels, built from row k-1 by evaluating only the new midpoints, followed by
+    its Richardson extrapolations.  From MIN_ROMBERG_LEVELS on, stops once the last two
+    diagonal entries agree to within the tolerance, or to within floating point precision
+    for very large areas.  The minimum keeps polynomials that happen to vanish on the
+    first few grids, e.g. x^4 - x^2 on [-1, 1], from converging to a wrong answer.
+    Returns a tuple of (tableau, number of polynomial evaluations)
+    """
+    evaluate = poly.evaluate
+    width = upper - lower
+    tableau = [[width * (evaluate(lower) + evaluate(upper)) / 2.0]]
+    evaluations = 2
+    for level in range(1, max_levels + 1):
+        panels = 1 << level
+        step = width / panels
+        new_points = math.fsum(evaluate(lower + index * step) for index in range(1, panels, 2))
+        evaluations += panels // 2
+        row = [tableau[-1][0] / 2.0 + step * new_points]
+        for column in range(1, level + 1):
+            factor = 4 ** column
+            row.append((factor * row[-1] - tableau[-1][column - 1]) / (factor - 1))
+        tableau.append(row)
+        precision = 8 * sys.float_info.epsilon * abs(row[-1])
+        if level >= MIN_ROMBERG_LEVELS and \
+                abs(row[-1] - tableau[-2][-1]) <= max(tolerance, precision):
+            break
+    else:
+        LOGGER.warning("Romberg integration did not converge in %s levels", max_levels)
+    return tableau, evaluations
+
+def romberg_integrate(poly, lower, upper, tolerance=DEFAULT_TOLERANCE):
+    """Romberg integration to the given tolerance.
+    Returns a tuple of (area, number of polynomial evaluations)
+    """
+    tableau, evaluations = romberg_tableau(poly, lower, upper, tolerance)
+    return tableau[-1][-1], evaluations
+
+@register_algorithm(adaptive=romberg_integrate)
+def romberg(poly, lower, upper):
+    """Calculate slice with Romberg integration to the default tolerance"""
+    return romberg_integrate(poly, lower, upper)[0]
+
+def legendre_value_slope(order, x):
+    """Legendre polynomial of the given order and its derivative at x, by recurrence"""
+    value, previous = 1.0, 0.0
+    for degree in range(1, order + 1):
+        value, previous = ((2 * degree - 1) * x * value - (degree - 1) * previous) / degree, value
+    return value, order * (x * value - previous) / (x * x - 1)
+
+def legendre_nodes_weights(order):
+    """Gauss-Legendre nodes and weights on [-1, 1] for the given order, up to
+    MAX_GAUSS_ORDER, computed once by Newton's method on the Legendre polynomial and then
+    kept in GAUSS_LEGENDRE_TABLE
+    """
+    if order in GAUSS_LEGENDRE_TABLE:
+        return GAUSS_LEGENDRE_TABLE[order]
+    if not 1 <= order <= MAX_GAUSS_ORDER:
+        raise ValueError(f"Gauss-Legendre order must be between 1 and {MAX_GAUSS_ORDER}")
+    nodes = [0.0] * order
+    weights = [0.0] * order
+    for index in range((order + 1) // 2):
+        root = math.cos(math.pi * (index + .75) / (order + .5))
+        for _ in range(100):
+            value, slope = legendre_value_slope(order, root)
+            root, last_root = root - value / slope, root
+            if abs(root - last_root) < 1e-15:
+                break
+        _, slope = legendre_value_slope(order, root)
+        nodes[index], nodes[-1 - index] = -root, root
+        weights[index] = weights[-1 - index] = 2 / ((1 - root * root) * slope * slope)
+    GAUSS_LEGENDRE_TABLE[order] = (tuple(nodes), tuple(weights))
+    return GAUSS_LEGENDRE_TABLE[order]
+
+class GaussLegendre:
+    """Gauss-Legendre algorithm of a given order:  order nodes per panel integrate
+    polynomials up to degree 2*order-1 exactly
+    """
+    algorithm = True
+    shares_nodes = False
+
+    def __init__(self, order=DEFAULT_GAUSS_ORDER):
+        self.order = order
+        self.unit_nodes, self.unit_weights = legendre_nodes_weights(order)
+        self.points_per_panel = order
+        self.exact_degree = 2 * order - 1
+        self.error_bound = (2 * order, math.factorial(order) ** 4
+                            / ((2 * order + 1) * math.factorial(2 * order) ** 3))
+        self.__name__ = f"gauss{order}"
+
+    def __eq__(self, other):
+        return isinstance(other, GaussLegendre) and self.order == other.order
+
+    def __hash__(self):
+        return hash((GaussLegendre, self.order))
+
+    def __call__(self, poly, lower, upper):
+        """Calculate Gauss-Legendre slice from order polynomial evaluations"""
+        half_width = (upper - lower) / 2.0
+        center = (upper + lower) / 2.0
+        evaluate = poly.evaluate
+        return half_width * math.fsum(weight * evaluate(center + half_width * node)
+                                      for node, weight in zip(self.unit_nodes, self.unit_weights))
+
+    def kernel(self, poly, points):
+        """Sum Gauss-Legendre slices over an array of grid points"""
+        nodes, weights = self.panel_nodes(points)
+        return numpy.sum(weights * poly.evaluate_array(nodes))
+
+    def panels(self, poly, points):
+        """Gauss-Legendre slices over an array of grid points"""
+        nodes, weights = self.panel_nodes(points)
+        return (weights * poly.evaluate_array(nodes)).reshape(-1, self.order).sum(axis=1)
+
+    def weights(self, points):
+        """Gauss-Legendre nodes and weights over a range of grid points"""
+        return self.panel_nodes(points[:-1].to_array() if len(points) > 1 else numpy.zeros(0),
+                                points.step)
+
+    def panel_nodes(self, lowers, step=None):
+        """Flattened nodes and weights of every panel, given an array of grid points or
+        an array of panel lower bounds and the step size
+        """
+        if step is None:
+            widths = numpy.diff(lowers)
+            lowers = lowers[:-1]
+        else:
+            widths = numpy.full(len(lowers), float(step))
+        half_widths = (widths / 2.0)[:, None]
+        nodes = (lowers[:, None] + half_widths) + half_widths * numpy.array(self.unit_nodes)
+        weights = half_widths * numpy.array(self.unit_weights)
+        return nodes.ravel(), weights.ravel()
+
+gauss = register_algorithm("gauss")(GaussLegendre())
+
+@register_algorithm(closed_form=True, exact_degree=math.inf)
+def exact(poly, lower, upper):
+    """Calculate exact slice from the polynomial's antiderivative"""
+    return poly.integrate(lower, upper)
+
 def get_algorithm(algorithm_name):
-    """Get algorithm function by name by looking up in globals with the 'algorithm' attribute set"""
-    if algorithm_name in globals() and "algorithm" in dir(globals()[algorithm_name]):
-        return globals()[algorithm_name]
-    LOGGER.error(f"Algorithm {algorithm_name} not found or invalid!")
+    """Get a registered algorithm by name.
+    gauss<order>, e.g. gauss3, gets a Gauss-Legendre algorithm of that order, up to
+    MAX_GAUSS_ORDER, and module:function imports an algorithm function that isn't registered yet.
+    """
+    if algorithm_name in ALGORITHMS:
+        return ALGORITHMS[algorithm_name]
+    gauss_match = re.fullmatch(r"gauss([1-9][0-9]*)", algorithm_name)
+    if gauss_match:
+        order = int(gauss_match.group(1))
+        if order <= MAX_GAUSS_ORDER:
+            return GaussLegendre(order)
+        LOGGER.error("Algorithm %s:  Gauss-Legendre order must be <= %s", algorithm_name,
+                     MAX_GAUSS_ORDER)
+        return None
+    module_name, _, function_name = algorithm_name.partition(":")
+    if module_name and function_name:
+        try:
+            algorithm = getattr(importlib.import_module(module_name), function_name)
+        except (ImportError, AttributeError) as err:
+            LOGGER.error("Algorithm %s could not be imported: %s", algorithm_name, err)
+            return None
+        if callable(algorithm):
+            return algorithm
+    LOGGER.error("Algorithm %s not found or invalid!", algorithm_name)
     return None
 
+def list_algorithms():
+    """Names of the registered algorithms"""
+    return sorted(ALGORITHMS)
+
+# Result caches
+def cache_key(poly, bounds, algorithm, tolerance=DEFAULT_TOLERANCE):
+    """Canonical hash of an integration:  sorted non-zero coefficients, bounds as floats,
+    the algorithm key, and the tolerance
+    """
+    canonical = (poly.key(), bounds.key(), algorithm_key(algorithm), float(tolerance))
+    return hashlib.sha256(repr(canonical).encode()).hexdigest()
+
+def algorithm_key(algorithm):
+    """Name that identifies an algorithm:  gauss<order> for Gauss-Legendre, the registered
+    name of registered algorithms, and module:qualname otherwise, with the object's id
+    added if the qualname isn't unique, e.g. for lambdas
+    """
+    if isinstance(algorithm, GaussLegendre):
+        return f"gauss{algorithm.order}"
+    for name, registered in ALGORITHMS.items():
+        if registered is algorithm:
+            return name
+    qualname = getattr(algorithm, "__qualname__", type(algorithm).__qualname__)
+    key = f"{algorithm.__module__}:{qualname}"
+    if "<" in qualname:
+        key += f"#{id(algorithm)}"
+    return key
+
+def uses_grid(algorithm):
+    """True if the algorithm integrates over the Bounds grid"""
+    return not (getattr(algorithm, "closed_form", False) or hasattr(algorithm, "adaptive"))
 
 # High-level implementation
-def area_under_curve(poly, bounds, algorithm):
-    """Finds the area under a polynomial between the specified bounds
-    using a rectangle-sum (of width 1) approximation.
+CHUNK_SIZE = 1 << 16
+
+def area_under_curve(poly, bounds, algorithm, #pylint: disable=too-many-arguments
+                     vectorize=True, tolerance=DEFAULT_TOLERANCE, workers=None,
+                     cache=None, stats=None):
+    """Finds the area under a polynomial between the specified bounds with the algorithm,
+    summing its panels over the grid of step_size wide panels from the lower bound.
+    If numpy is available and the algorithm has a vectorized kernel, the grid is
+    evaluated CHUNK_SIZE points at a time instead of one panel at a time.
+    Otherwise the algorithm's composite rule evaluates each grid point once.
+    Adaptive algorithms ignore the step size and refine to the given tolerance, and
+    closed form algorithms ignore it entirely.
+    If workers is set, the grid is split into CHUNK_SIZE point blocks that are integrated
+    in a pool of that many processes, and the block areas are summed with math.fsum, so
+    the result does not depend on the number of workers.
+    If cache is set, e.g. to the in-memory caches.RESULT_CACHE, results are looked up
+    in and stored to it.
+    Pass an IntegrationStats as stats to collect evaluation counts and phase timings.
     """
-    LOGGER.info(poly)
-    LOGGER.info(bounds)
-    LOGGER.info(f"Algorithm: {algorithm.__name__}")
-    range_upper_index = len(bounds.full_range) - 1
+    LOGGER.info("%s", poly)
+    LOGGER.info("%s", bounds)
+    LOGGER.info("Algorithm: %s", algorithm.__name__)
+    poly.check_domain(bounds.lower_bound)
+    if stats is not None:
+        if uses_grid(algorithm):
+            stats.panels += len(bounds.full_range) - 1
+        poly = stats.counting(poly)
+        start = time.perf_counter()
+    if cache is None:
+        area = integrate_bounds(poly, bounds, algorithm, vectorize, tolerance, workers)
+    else:
+        key = cache_key(poly, bounds, algorithm, tolerance)
+        area = cache.get(key)
+        if area is None:
+            area = integrate_bounds(poly, bounds, algorithm, vectorize, tolerance, workers)
+            cache.put(key, area)
+    if stats is not None:
+        stats.record("integration", time.perf_counter() - start)
+    return area
+
+def integrate_bounds(poly, bounds, algorithm, #pylint: disable=too-many-arguments
+                     vectorize=True, tolerance=DEFAULT_TOLERANCE, workers=None):
+    """area_under_curve without logging"""
+    poly.check_domain(bounds.lower_bound)
+    if getattr(algorithm, "closed_form", False):
+        return algorithm(poly, bounds.lower_bound, bounds.upper_bound)
+    adaptive_rule = getattr(algorithm, "adaptive", None)
+    if adaptive_rule is not None:
+        area, _ = adaptive_rule(poly, bounds.lower_bound, bounds.upper_bound, tolerance)
+        return area
+    if workers is not None:
+        return integrate_parallel(poly, bounds.full_range, algorithm, vectorize, workers)
+    return integrate_points(poly, bounds.full_range, algorithm, vectorize)
+
+def integrate_points(poly, points, algorithm, vectorize=True):
+    """Area over a FloatRange of grid points with the fastest rule the algorithm has"""
+    kernel = getattr(algorithm, "kernel", None)
+    weights = getattr(algorithm, "weights", None)
+    if vectorize and numpy is not None and kernel is not None:
+        return math.fsum(float(kernel(poly, chunk.to_array()))
+                         for chunk in points.chunks(CHUNK_SIZE))
+    if vectorize and numpy is not None and weights is not None:
+        return math.fsum(float(numpy.dot(chunk_weights, poly.evaluate_array(nodes)))
+                         for nodes, chunk_weights in map(weights, points.chunks(CHUNK_SIZE)))
+    composite = getattr(algorithm, "composite", None)
+    if composite is not None:
+        return composite(poly, points)
+    points = iter(points)
+    lower = next(points)
     total_area = 0
-    for range_index, val in enumerate(bounds.full_range):
-        # Can't calculate trapezoid with only lower bound value, so we're done summing.
-        if range_index == range_upper_index:
-            return total_area
-        total_area += algorithm(poly, val, bounds.full_range[range_index + 1])
+    for upper in points:
+        total_area += algorithm(poly, lower, upper)
+        lower = upper
     return total_area
-# Entrypoints
-def area_under_curve_argv(args):
-    """Command-line entrypoint"""
-    parsed_parameters = parse_commandline_arguments(args[1:])
-    if not parsed_parameters:
-        print(FULL_USAGE)
-        sys.exit(2)
-    area = area_under_curve(parsed_parameters.polynomial,
-                            parsed_parameters.bounds, parsed_parameters.algorithm)
-    print(f"Total Area ({parsed_parameters.algorithm.__name__}) = {area}")
+
+def integrate_blocks(poly, points, algorithm, vectorize=True):
+    """Areas of each CHUNK_SIZE point block of a FloatRange of grid points"""
+    return [integrate_points(poly, block, algorithm, vectorize)
+            for block in points.chunks(CHUNK_SIZE)]
+
+def integrate_parallel(poly, points, algorithm, vectorize=True, workers=1):
+    """Area over a FloatRange of grid points, with contiguous runs of blocks integrated in
+    a process pool.  Runs start on block boundaries, so every worker count sums the same
+    block areas.
+    """
+    panels = len(points) - 1
+    if panels < 1:
+        return 0
+    block_panels = CHUNK_SIZE - 1
+    blocks = -(-panels // block_panels)
+    run_panels = -(-blocks // workers) * block_panels
+    runs = [points[start:start + run_panels + 1] for start in range(0, panels, run_panels)]
+    if workers == 1 or len(runs) == 1:
+        block_areas = [integrate_blocks(poly, run, algorithm, vectorize) for run in runs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            block_areas = list(executor.map(integrate_blocks, [poly] * len(runs), runs,
+                                            [algorithm] * len(runs), [vectorize] * len(runs)))
+    return math.fsum(area for run_areas in block_areas for area in run_areas)
 
 
 if __name__ == '__main__':
-    FULL_USAGE = f'{__doc__}\nUsage: python {sys.argv[0]} {USAGE}'
-    area_under_curve_argv(sys.argv)
+    # The command line lives in the package this file belongs to.  Import the package
+    # from its parent directory, with this running module standing in for its
+    # area_under_curve module, so the module isn't loaded twice.
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.modules["area_under_curve.area_under_curve"] = sys.modules[__name__]
+    from area_under_curve import arguments, cli # pylint: disable=import-outside-toplevel
+    arguments.FULL_USAGE = f'{__doc__}\nUsage: python {sys.argv[0]} {arguments.USAGE}'
+    cli.area_under_curve_argv(sys.argv)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+"""Command line argument parsing into Parameters"""
+import ast
+import getopt
+import math
+import sys
+from dataclasses import dataclass
+from typing import Callable
+
+from .area_under_curve import (DEFAULT_TOLERANCE, LOGGER, Bounds, Polynomial, any_negative,
+                               any_non_int_numbers, cache_key, get_algorithm)
+from .steps import auto_step
+
+USAGE = """ -p|--poly {DegreeN1:CoefficientM1, DegreeN2:CoefficientM2, ...}
+-l|--lower <lower_bound> -u|--upper <upper_bound> -s|--step <step> 
+-a|--algorithm <simpson | trapezoid | midpoint | gauss | gauss<order> | adaptive | romberg | exact
+                | module:function>
+-t|--tolerance <tolerance> (adaptive and romberg refine to it, other rules with an error
+  bound pick the largest step that guarantees it, and the step size is ignored)
+-e|--exact (also report the exact area and the approximation error)
+-w|--workers <workers> (integrate the grid in a pool of worker processes)
+-c|--cache <file> (look up and store results in a sqlite cache file)
+--compare (midpoint, trapezoid, and simpson areas from one pass, with their errors)
+--target <area> (solve for the upper bound where the area reaches target, searching from
+  the given upper bound)
+-f|--samples <file | -> (integrate x,y samples instead of a polynomial, trapezoid and simpson
+  only:  .csv/.txt files and stdin are text, anything else is binary float64 x,y pairs)
+  defaults: step_size:1, lower_bound:0, upper_bound:10, algorithm:trapezoid, tolerance:1e-9
+--serve <unix:/path/to/socket | host:port> (answer JSON-lines requests with fields
+  polynomial, lower, upper, step, algorithm, tolerance)
+--batch <file | -> (answer the same JSON-lines requests from a file or stdin)
+
+e.g. To evaluate the area of y=x^2 + 2x -2 from [1-50] with .1 width sums and the midpoint algorithm:
+ python area_under_curve.py --poly "{2:1, 1:2, 0:-2}" --lower 1 --upper 50 --step .1 --algorithm midpoint
+"""
+
+FULL_USAGE = USAGE
+
+OPTIONS = "hel:u:s:a:p:t:w:c:f:"
+LONG_OPTIONS = ["lower=", "upper=", "step=", "algorithm=", "polynomial=", "tolerance=", "exact",
+                "workers=", "cache=", "samples=", "target=", "compare", "help"]
+NON_NUMERICAL_OPTIONS = ["-a", "--algorithm", "-p", "--polynomial", "-h", "--help",
+                         "-e", "--exact", "-c", "--cache", "-f", "--samples", "--compare"]
+DEFAULT_SETTINGS = {"lower": 0, "upper": 10, "step_size": 1, "algorithm": "trapezoid",
+                    "tolerance": DEFAULT_TOLERANCE, "tolerance_given": False,
+                    "report_exact": False, "workers": None, "cache_path": None,
+                    "samples_path": None, "target_area": None, "compare": False}
+
+@dataclass
+class Parameters: #pylint: disable=too-many-instance-attributes
+    """Contains several groups of parameters"""
+    polynomial: Polynomial
+    bounds: Bounds
+    algorithm: Callable
+    tolerance: float = DEFAULT_TOLERANCE
+    report_exact: bool = False
+    workers: int = None
+    cache_path: str = None
+    samples_path: str = None
+    target_area: float = None
+    compare: bool = False
+
+    @classmethod
+    def factory(cls, polynomial_coefficients, #pylint: disable=too-many-arguments
+                lower, upper, step, algorithm, tolerance=DEFAULT_TOLERANCE,
+                report_exact=False, workers=None, cache_path=None, samples_path=None,
+                target_area=None, compare=False):
+        """Create parameters object from polynomial, bounds, and algorithm parameters"""
+        bounds = Bounds(lower, upper, step)
+        polynomial = Polynomial(polynomial_coefficients)
+        return cls(polynomial, bounds, algorithm, tolerance, report_exact, workers, cache_path,
+                   samples_path, target_area, compare)
+
+    def cache_key(self):
+        """Canonical hash of the polynomial, bounds, algorithm, and tolerance"""
+        return cache_key(self.polynomial, self.bounds, self.algorithm, self.tolerance)
+
+def parse_commandline_arguments(argv):
+    """Parse command line arguments and return a parameters
+    object with Bounds, Polynomial, and Algorithm
+    """
+    opts = parse_options(argv)
+    if opts is None:
+        return None
+    settings = option_settings(opts)
+    if settings is None or not valid_settings(settings):
+        return None
+    algorithm_function = get_algorithm(settings["algorithm"])
+    if not algorithm_function:
+        LOGGER.error("Algorithm : %s not found!", settings["algorithm"])
+        return None
+    if settings["samples_path"] is not None:
+        return sample_parameters(settings, algorithm_function)
+    return polynomial_parameters(settings, algorithm_function)
+
+def parse_options(argv):
+    """getopt (option, value) pairs, or None if an option is unknown or a numerical
+    option has a value that isn't a number
+    """
+    try:
+        opts, _ = getopt.getopt(argv, OPTIONS, LONG_OPTIONS)
+    except getopt.GetoptError as err:
+        LOGGER.error("Option error: %s", err)
+        return None
+    numerical_params = list(filter(lambda t: t[0] not in NON_NUMERICAL_OPTIONS, opts))
+    if any(map(lambda n: not is_number(n[1]), numerical_params)):
+        LOGGER.error("Error in numerical arguments.")
+        return None
+    return opts
+
+def option_settings(opts): # pylint: disable=too-many-branches
+    """Settings dictionary from getopt (option, value) pairs, with DEFAULT_SETTINGS for the
+    options that aren't given, or None if the workers value is invalid
+    """
+    settings = dict(DEFAULT_SETTINGS, polynomial_coefficients={})
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+            LOGGER.info(FULL_USAGE)
+            sys.exit(0)
+        elif opt in ("-l", "--lower"):
+            settings["lower"] = float(arg)
+        elif opt in ("-u", "--upper"):
+            settings["upper"] = float(arg)
+        elif opt in ("-s", "--step"):
+            settings["step_size"] = float(arg)
+        elif opt in ("-a", "--algorithm"):
+            settings["algorithm"] = arg
+        elif opt in ("-p", "--polynomial"):
+            settings["polynomial_coefficients"] = parse_polynomial_coefficients(arg)
+        elif opt in ("-t", "--tolerance"):
+            settings["tolerance"] = float(arg)
+            settings["tolerance_given"] = True
+        elif opt in ("-e", "--exact"):
+            settings["report_exact"] = True
+        elif opt in ("-w", "--workers"):
+            workers = float(arg)
+            if workers < 1 or not workers.is_integer():
+                LOGGER.error("workers must be a positive integer: %s", arg)
+                return None
+            settings["workers"] = int(workers)
+        elif opt in ("-c", "--cache"):
+            settings["cache_path"] = arg
+        elif opt in ("-f", "--samples"):
+            settings["samples_path"] = arg
+        elif opt == "--target":
+            settings["target_area"] = float(arg)
+        elif opt == "--compare":
+            settings["compare"] = True
+    return settings
+
+def valid_settings(settings):
+    """Check the step size, tolerance, and bounds, and log the first invalid one"""
+    lower, upper = settings["lower"], settings["upper"]
+    if settings["step_size"] <= 0:
+        LOGGER.error("step size must be > 0: %s", settings["step_size"])
+        return False
+    if not math.isfinite(settings["tolerance"]) or settings["tolerance"] <= 0:
+        LOGGER.error("tolerance must be finite and > 0: %s", settings["tolerance"])
+        return False
+    if lower >= upper:
+        LOGGER.error("invalid bounds: %s %s", lower, upper)
+        return False
+    if (lower < 0 or upper < 0) and any_non_int_numbers(settings["polynomial_coefficients"]):
+        LOGGER.error("Fractional exponents not supported for negative values.")
+        return False
+    return True
+
+def sample_parameters(settings, algorithm_function):
+    """Parameters for integrating the samples file, if the algorithm has a samples rule"""
+    if not hasattr(algorithm_function, "samples"):
+        LOGGER.error("Algorithm : %s does not support samples", settings["algorithm"])
+        return None
+    return Parameters.factory({}, settings["lower"], settings["upper"], settings["step_size"],
+                              algorithm_function, settings["tolerance"],
+                              workers=settings["workers"],
+                              samples_path=settings["samples_path"])
+
+def polynomial_parameters(settings, algorithm_function):
+    """Parameters for integrating the polynomial, with the step size auto_step picks if a
+    tolerance is given and the algorithm has an error bound
+    """
+    polynomial_coefficients = settings["polynomial_coefficients"]
+    if not polynomial_coefficients:
+        LOGGER.error("Polynomial not specified or invalid")
+        return None
+    if any_negative(polynomial_coefficients):
+        LOGGER.error("Only positive exponents supported")
+        return None
+    lower, upper, tolerance = settings["lower"], settings["upper"], settings["tolerance"]
+    step_size = settings["step_size"]
+    if settings["tolerance_given"] and hasattr(algorithm_function, "error_bound"):
+        try:
+            step_size = auto_step(Polynomial(polynomial_coefficients), lower, upper,
+                                  algorithm_function, tolerance)
+        except ValueError as err:
+            LOGGER.error("%s", err)
+            return None
+        LOGGER.info("Step size for tolerance %s: %s", tolerance, step_size)
+    return Parameters.factory(polynomial_coefficients,
+                              lower, upper, step_size, algorithm_function, tolerance,
+                              settings["report_exact"], settings["workers"],
+                              settings["cache_path"], target_area=settings["target_area"],
+                              compare=settings["compare"])
+
+def parse_polynomial_coefficients(dict_literal):
+    """Try to parse string into dictionary, return None on failure"""
+    coefficient_dict = {}
+    try:
+        coefficient_dict = ast.literal_eval(dict_literal)
+    except SyntaxError as errs:
+        LOGGER.error("Syntax Error parsing polynomial args: %s %s", dict_literal, errs)
+    except ValueError as errv:
+        LOGGER.error("Value Error parsing polynomial args: %s %s", dict_literal, errv)
+        return None
+    if not isinstance(coefficient_dict, dict):
+        LOGGER.error("Malformed dictionary: %s", coefficient_dict)
+        return None
+    return coefficient_dict
+
+def is_number(string):
+    """Simple check to see if string is valid number"""
+    try:
+        float(string)
+        return True
+    except ValueError as err:
+        LOGGER.error("Error: %s %s", string, err)
+        return False
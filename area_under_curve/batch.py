@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""Many areas at once:  batches of jobs over shared grids, midpoint, trapezoid, and simpson
+from one pass, and progressive partial areas of one grid
+"""
+import math
+import time
+from dataclasses import dataclass
+
+from .area_under_curve import (CHUNK_SIZE, DEFAULT_TOLERANCE, LOGGER, gauss, integrate_bounds,
+                               integrate_points, midpoint, numpy, trapezoid, uses_grid)
+from .arguments import Parameters
+
+def area_under_curve_batch(jobs, vectorize=True, tolerance=DEFAULT_TOLERANCE):
+    """Finds the areas for many (polynomial, bounds, algorithm) triples or Parameters
+    objects and returns them in input order.
+    With numpy, jobs sharing a grid and an algorithm with quadrature weights are solved
+    together:  the shared nodes and weights are computed once per chunk, and each job's
+    area is the dot product of the weights with its compiled evaluator's values at the
+    nodes.  Other jobs are integrated one at a time without logging.
+    """
+    jobs = [(job.polynomial, job.bounds, job.algorithm) if isinstance(job, Parameters) else job
+            for job in jobs]
+    areas = [None] * len(jobs)
+    groups = {}
+    for index, (poly, bounds, algorithm) in enumerate(jobs):
+        if vectorize and numpy is not None and hasattr(algorithm, "weights"):
+            groups.setdefault((algorithm, bounds.full_range), []).append(index)
+        else:
+            areas[index] = integrate_bounds(poly, bounds, algorithm, vectorize, tolerance)
+    for (algorithm, points), indexes in groups.items():
+        polynomials = [jobs[index][0] for index in indexes]
+        for index, area in zip(indexes, batch_moment_areas(polynomials, points, algorithm)):
+            areas[index] = area
+    return areas
+
+@dataclass
+class Comparison:
+    """Midpoint, trapezoid, and simpson areas over one grid, and the exact area"""
+    midpoint: float
+    trapezoid: float
+    simpson: float
+    exact: float = None
+
+    def errors(self):
+        """Approximation error of each algorithm by name, if the exact area is known"""
+        if self.exact is None:
+            return {}
+        return {name: getattr(self, name) - self.exact
+                for name in ("midpoint", "trapezoid", "simpson")}
+
+def compare_algorithms(poly, bounds, vectorize=True):
+    """Finds the midpoint, trapezoid, and simpson areas under a polynomial in one pass over
+    the grid:  each CHUNK_SIZE point block is integrated with the midpoint and trapezoid
+    rules, and simpson is (2 * midpoint + trapezoid) / 3, since its weights are exactly
+    those of the two, so every node is evaluated once, as in a single simpson run.
+    The exact area is included if the polynomial can integrate itself, over the same
+    range as the grid, which ends short of the upper bound if the step doesn't divide it.
+    """
+    LOGGER.info("%s", poly)
+    LOGGER.info("%s", bounds)
+    poly.check_domain(bounds.lower_bound)
+    points = bounds.full_range
+    midpoint_areas = []
+    trapezoid_areas = []
+    for chunk in points.chunks(CHUNK_SIZE):
+        midpoint_areas.append(integrate_points(poly, chunk, midpoint, vectorize))
+        trapezoid_areas.append(integrate_points(poly, chunk, trapezoid, vectorize))
+    midpoint_area = math.fsum(midpoint_areas)
+    trapezoid_area = math.fsum(trapezoid_areas)
+    integrate = getattr(poly, "integrate", None)
+    exact_area = integrate(points.lower, points[-1]) if integrate else None
+    return Comparison(midpoint_area, trapezoid_area, (2 * midpoint_area + trapezoid_area) / 3,
+                      exact_area)
+
+def batch_moment_areas(polynomials, points, algorithm):
+    """Areas of several polynomials over one shared grid, using the algorithm's weights.
+    Each CHUNK_SIZE point block's nodes and weights are computed once and shared by every
+    polynomial, and each polynomial's block areas are summed with math.fsum.
+    """
+    for poly in polynomials:
+        poly.check_domain(points.lower)
+    block_areas = [[] for _ in polynomials]
+    for chunk in points.chunks(CHUNK_SIZE):
+        nodes, weights = algorithm.weights(chunk)
+        for poly, areas in zip(polynomials, block_areas):
+            areas.append(float(numpy.dot(weights, poly.evaluate_array(nodes))))
+    return [math.fsum(areas) for areas in block_areas]
+
+
+@dataclass
+class PartialArea:
+    """Progress report from area_under_curve_progressive"""
+    area: float
+    fraction: float
+    estimate: float
+    error: float
+
+def area_under_curve_progressive(poly, bounds, algorithm, #pylint: disable=too-many-arguments
+                                 interval=CHUNK_SIZE, vectorize=True, tolerance=None,
+                                 deadline=None):
+    """Generator version of area_under_curve that walks the grid from left to right and
+    yields a PartialArea every interval panels.  area is the sum so far, fraction the share
+    of panels done, estimate the area plus a single-panel Gauss-Legendre estimate of the
+    rest of the grid, and error the change in estimate since the last report.
+    Iteration stops early once error <= tolerance or time.monotonic() passes deadline, and
+    panels past the last report are never evaluated, so callers can also just stop reading.
+    Algorithms that don't walk the grid yield one final result.
+    """
+    LOGGER.info("%s", poly)
+    LOGGER.info("%s", bounds)
+    LOGGER.info("Algorithm: %s", algorithm.__name__)
+    if not uses_grid(algorithm):
+        area = integrate_bounds(poly, bounds, algorithm, vectorize)
+        yield PartialArea(area, 1.0, area, 0.0)
+        return
+    poly.check_domain(bounds.lower_bound)
+    points = bounds.full_range
+    panels = len(points) - 1
+    area = 0
+    done = 0
+    estimate = None
+    for chunk in points.chunks(interval + 1):
+        area += integrate_points(poly, chunk, algorithm, vectorize)
+        done += len(chunk) - 1
+        remainder = gauss(poly, chunk[-1], points[-1]) if done < panels else 0
+        error = math.inf if estimate is None else abs(area + remainder - estimate)
+        estimate = area + remainder
+        yield PartialArea(area, done / panels, estimate, error)
+        if tolerance is not None and error <= tolerance:
+            return
+        if deadline is not None and time.monotonic() > deadline:
+            return
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""Result caches:  areas stored by cache_key, in memory or in a sqlite file"""
+import sqlite3
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_DISK_CACHE_SIZE = 100000
+
+class ResultCache:
+    """Bounded in-memory LRU cache of areas by cache key"""
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Return the cached area or None, and mark the entry as recently used"""
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, area):
+        """Store an area, evicting the least recently used entries past max_size"""
+        self.entries[key] = area
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+class DiskCache:
+    """Persistent sqlite cache of areas by cache key, evicting the least recently used
+    entries past max_size
+    """
+    def __init__(self, path, max_size=DEFAULT_DISK_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS results "
+                                "(key TEXT PRIMARY KEY, area REAL, last_used REAL)")
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, key):
+        """Return the cached area or None, and mark the entry as recently used"""
+        row = self.connection.execute("SELECT area FROM results WHERE key = ?",
+                                      (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self.connection:
+            self.connection.execute("UPDATE results SET last_used = ? WHERE key = ?",
+                                    (time.time(), key))
+        return row[0]
+
+    def put(self, key, area):
+        """Store an area, evicting the least recently used entries past max_size"""
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                                    (key, area, time.time()))
+            self.connection.execute("DELETE FROM results WHERE key NOT IN (SELECT key FROM "
+                                    "results ORDER BY last_used DESC LIMIT ?)",
+                                    (self.max_size,))
+
+    def close(self):
+        """Close the sqlite connection"""
+        self.connection.close()
+
+RESULT_CACHE = ResultCache()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Command-line entrypoint"""
+import sys
+
+from . import arguments
+from .area_under_curve import area_under_curve, uses_grid
+from .arguments import parse_commandline_arguments
+from .batch import compare_algorithms
+from .caches import DiskCache, RESULT_CACHE
+from .samples import area_under_samples
+from .server import answer_batch, serve
+from .solver import solve_upper_bound
+
+def area_under_curve_argv(args):
+    """Command-line entrypoint"""
+    if len(args) == 3 and args[1] == "--serve":
+        serve(args[2])
+        return
+    if len(args) == 3 and args[1] == "--batch":
+        answer_batch_file(args[2])
+        return
+    parsed_parameters = parse_commandline_arguments(args[1:])
+    if not parsed_parameters:
+        print(arguments.FULL_USAGE)
+        sys.exit(2)
+    if parsed_parameters.samples_path is not None:
+        print_samples_area(parsed_parameters)
+    elif parsed_parameters.target_area is not None:
+        print_upper_bound(parsed_parameters)
+    elif parsed_parameters.compare:
+        print_comparison(parsed_parameters)
+    else:
+        print_area(parsed_parameters)
+
+def answer_batch_file(path):
+    """Answer the JSON-lines requests in a file, or stdin if path is "-", on stdout"""
+    if path == "-":
+        answer_batch(sys.stdin, sys.stdout)
+        return
+    with open(path, encoding="utf-8") as input_stream:
+        answer_batch(input_stream, sys.stdout)
+
+def print_samples_area(parameters):
+    """Print the area under the samples file"""
+    algorithm = parameters.algorithm
+    area = area_under_samples(parameters.samples_path, algorithm, parameters.workers)
+    print(f"Total Area ({algorithm.__name__}) = {area}")
+
+def print_upper_bound(parameters):
+    """Print the upper bound where the area reaches the target area"""
+    algorithm = parameters.algorithm
+    bounds = parameters.bounds
+    upper = solve_upper_bound(parameters.polynomial, bounds.lower_bound, parameters.target_area,
+                              algorithm, parameters.tolerance, bounds.step_size,
+                              bounds.upper_bound)
+    print(f"Upper Bound ({algorithm.__name__}) = {upper}")
+
+def print_comparison(parameters):
+    """Print the midpoint, trapezoid, and simpson areas with their errors"""
+    comparison = compare_algorithms(parameters.polynomial, parameters.bounds)
+    errors = comparison.errors()
+    for name, error in errors.items():
+        print(f"Total Area ({name}) = {getattr(comparison, name)}, error = {error}")
+    print(f"Exact Area = {comparison.exact}")
+
+def print_area(parameters):
+    """Print the area, looked up in and stored to the cache file if one is given, and the
+    exact area and error if requested
+    """
+    algorithm = parameters.algorithm
+    disk_cache = DiskCache(parameters.cache_path) if parameters.cache_path else None
+    area = None if disk_cache is None else disk_cache.get(parameters.cache_key())
+    if area is not None:
+        print(f"Total Area ({algorithm.__name__}) = {area} (cached)")
+    else:
+        area = integrate_parameters(parameters)
+    if disk_cache is not None:
+        if disk_cache.misses:
+            disk_cache.put(parameters.cache_key(), area)
+        disk_cache.close()
+    if parameters.report_exact:
+        bounds = parameters.bounds
+        # Grid algorithms stop at the last grid point, so compare over the same range
+        upper = bounds.full_range[-1] if uses_grid(algorithm) else bounds.upper_bound
+        exact_area = parameters.polynomial.integrate(bounds.lower_bound, upper)
+        print(f"Exact Area = {exact_area}, error = {area - exact_area}")
+
+def integrate_parameters(parameters):
+    """Print and return the area, with the evaluation count for adaptive algorithms"""
+    algorithm = parameters.algorithm
+    bounds = parameters.bounds
+    adaptive_rule = getattr(algorithm, "adaptive", None)
+    if adaptive_rule is not None:
+        area, evaluations = adaptive_rule(parameters.polynomial, bounds.lower_bound,
+                                          bounds.upper_bound, parameters.tolerance)
+        print(f"Total Area ({algorithm.__name__}) = {area} ({evaluations} evaluations)")
+    else:
+        area = area_under_curve(parameters.polynomial, bounds, algorithm,
+                                workers=parameters.workers, cache=RESULT_CACHE)
+        print(f"Total Area ({algorithm.__name__}) = {area}")
+    return area
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Cumulative area index:  prefix sums of panel areas for fast area queries"""
+import mmap
+import struct
+from array import array
+
+from .area_under_curve import CHUNK_SIZE, Bounds, cache_key, numpy
+
+class CumulativeArea:
+    """Prefix sums of the panel areas of an algorithm over a Bounds grid, so the area
+    over any [lower, upper] within the bounds takes two lookups plus the algorithm over
+    the partial panels at each edge.  Prefix sums are kept in a numpy array, an
+    array('d'), or a memory-mapped file written by save.
+    """
+    HEADER = struct.Struct("=64sddd")
+
+    def __init__(self, poly, bounds, algorithm, #pylint: disable=too-many-arguments
+                 prefix=None, vectorize=True):
+        self.poly = poly
+        self.bounds = bounds
+        self.algorithm = algorithm
+        self.points = bounds.full_range
+        if prefix is None:
+            poly.check_domain(bounds.lower_bound)
+            prefix = cumulative_panel_areas(poly, self.points, algorithm, vectorize)
+        if len(prefix) != len(self.points):
+            raise ValueError("prefix sums don't match the grid")
+        self.prefix = prefix
+
+    def panel_index(self, value):
+        """Index of the last grid point at or below value"""
+        points = self.points
+        index = min(max(int((value - points.lower) / points.step), 0), len(points) - 1)
+        while index > 0 and points[index] > value:
+            index -= 1
+        while index < len(points) - 1 and points[index + 1] <= value:
+            index += 1
+        return index
+
+    def area(self, lower, upper):
+        """Area between lower and upper, which must lie within the bounds"""
+        if not self.bounds.lower_bound <= lower <= upper <= self.bounds.upper_bound:
+            raise ValueError(f"[{lower}, {upper}] is outside {self.bounds}")
+        first = self.panel_index(lower)
+        last = self.panel_index(upper)
+        if first == last:
+            return self.algorithm(self.poly, lower, upper) if upper > lower else 0.0
+        area = float(self.prefix[last]) - float(self.prefix[first + 1])
+        if lower > self.points[first]:
+            area += self.algorithm(self.poly, lower, self.points[first + 1])
+        else:
+            area += float(self.prefix[first + 1]) - float(self.prefix[first])
+        if upper > self.points[last]:
+            area += self.algorithm(self.poly, self.points[last], upper)
+        return area
+
+    def save(self, path):
+        """Write the prefix sums, after a header identifying the polynomial, algorithm,
+        and bounds, as native float64s
+        """
+        key = cache_key(self.poly, self.bounds, self.algorithm).encode()
+        with open(path, "wb") as index_file:
+            index_file.write(self.HEADER.pack(key, *self.bounds.key()))
+            index_file.write(self.prefix.tobytes() if numpy is None
+                             else numpy.asarray(self.prefix, dtype=numpy.float64).tobytes())
+
+    @classmethod
+    def load(cls, path, poly, algorithm):
+        """Memory-map an index written by save, for the same polynomial and algorithm"""
+        with open(path, "rb") as index_file:
+            mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        key, lower, upper, step = cls.HEADER.unpack_from(mapped)
+        bounds = Bounds(lower, upper, step)
+        if key.decode() != cache_key(poly, bounds, algorithm):
+            raise ValueError(f"{path} is not an index of {poly} with {algorithm.__name__}")
+        return cls(poly, bounds, algorithm, memoryview(mapped)[cls.HEADER.size:].cast("d"))
+
+def cumulative_panel_areas(poly, points, algorithm, vectorize=True):
+    """Prefix sums of the panel areas over a FloatRange of grid points, starting at 0"""
+    panels = getattr(algorithm, "panels", None)
+    if vectorize and numpy is not None and panels is not None:
+        prefix = numpy.zeros(len(points))
+        total = 0.0
+        start = 1
+        for chunk in points.chunks(CHUNK_SIZE):
+            sums = numpy.cumsum(panels(poly, chunk.to_array())) + total
+            prefix[start:start + len(sums)] = sums
+            start += len(sums)
+            total = sums[-1]
+        return prefix
+    prefix = array("d", [0.0])
+    for lower, upper in zip(points, points[1:]):
+        prefix.append(prefix[-1] + algorithm(poly, lower, upper))
+    return prefix
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""Tabulated samples:  areas under measured x, y samples from binary or text files"""
+import itertools
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .area_under_curve import CHUNK_SIZE, LOGGER, numpy
+
+# Sample files with these suffixes are read as text, anything else as binary float64
+TEXT_SAMPLE_SUFFIXES = (".csv", ".txt")
+
+SAMPLE_CHUNK_SIZE = CHUNK_SIZE + 1
+
+def area_under_samples(path, algorithm, workers=None, chunk_size=SAMPLE_CHUNK_SIZE):
+    """Finds the area under tabulated (x, y) samples with the algorithm's samples rule.
+    path is read with read_samples, or as text from stdin if it is "-".  Samples are
+    integrated chunk_size at a time (odd, so Simpson pairs line up across chunks), with
+    neighboring chunks sharing their boundary sample, and the chunk areas are summed
+    with math.fsum.  If workers is set, binary files are split into runs of chunks that
+    are integrated in a pool of that many processes, each memory-mapping the file itself,
+    and the result does not depend on the number of workers.
+    """
+    if numpy is None:
+        raise ImportError("Samples require numpy:  pip install area_under_curve[numpy]")
+    if chunk_size < 3 or chunk_size % 2 == 0:
+        raise ValueError("sample chunk size must be odd and >= 3")
+    LOGGER.info("Samples: %s", path)
+    LOGGER.info("Algorithm: %s", algorithm.__name__)
+    if path == "-":
+        chunks = text_sample_chunks(sys.stdin, chunk_size)
+        return math.fsum(algorithm.samples(x, y) for x, y in chunks)
+    if path.lower().endswith(TEXT_SAMPLE_SUFFIXES):
+        with open(path, encoding="utf-8") as stream:
+            return math.fsum(algorithm.samples(x, y)
+                             for x, y in text_sample_chunks(stream, chunk_size))
+    count = len(read_samples(path))
+    block_samples = chunk_size - 1
+    blocks = max(-(-(count - 1) // block_samples), 1)
+    run_samples = -(-blocks // (workers or 1)) * block_samples
+    runs = [(start, min(start + run_samples + 1, count))
+            for start in range(0, max(count - 1, 1), run_samples)]
+    if workers is None or workers == 1 or len(runs) == 1:
+        block_areas = [integrate_sample_blocks(path, algorithm, start, stop, chunk_size)
+                       for start, stop in runs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            block_areas = list(executor.map(integrate_sample_blocks, [path] * len(runs),
+                                            [algorithm] * len(runs), *zip(*runs),
+                                            [chunk_size] * len(runs)))
+    return math.fsum(area for run_areas in block_areas for area in run_areas)
+
+def read_samples(path):
+    """Memory-map a binary file of float64 (x, y) pairs as an (n, 2) array, or raise
+    ValueError if the file doesn't hold a whole number of pairs
+    """
+    size = os.path.getsize(path)
+    pair_size = 2 * numpy.dtype(numpy.float64).itemsize
+    if size == 0 or size % pair_size:
+        raise ValueError(f"Sample file {path} must hold float64 (x, y) pairs, "
+                         f"but has {size} bytes")
+    return numpy.memmap(path, dtype=numpy.float64, mode="r").reshape(-1, 2)
+
+def integrate_sample_blocks(path, algorithm, start, stop, chunk_size=SAMPLE_CHUNK_SIZE):
+    """Areas of each chunk_size sample block of rows [start, stop) of a binary sample file"""
+    samples = read_samples(path)
+    areas = []
+    while start < stop - 1:
+        block = samples[start:min(start + chunk_size, stop)]
+        areas.append(algorithm.samples(block[:, 0], block[:, 1]))
+        start += chunk_size - 1
+    return areas
+
+def text_sample_chunks(stream, chunk_size=SAMPLE_CHUNK_SIZE):
+    """Yield (x, y) arrays of chunk_size samples parsed from text lines of comma or
+    whitespace separated x, y values.  Neighboring chunks share their boundary sample,
+    blank and # comment lines are skipped, and so is a first line that isn't numeric.
+    """
+    lines = (line.replace(",", " ") for line in stream
+             if line.strip() and not line.lstrip().startswith("#"))
+    first = next(lines, None)
+    if first is None:
+        return
+    try:
+        float(first.split()[0])
+        lines = itertools.chain([first], lines)
+    except ValueError:
+        pass
+    previous = numpy.zeros((0, 2))
+    while True:
+        block = list(itertools.islice(lines, chunk_size - len(previous)))
+        if not block:
+            return
+        samples = numpy.concatenate([previous, numpy.loadtxt(block, ndmin=2)[:, :2]])
+        yield samples[:, 0], samples[:, 1]
+        previous = samples[-1:]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+"""JSON-lines requests:  batch mode, the integration server, and its client"""
+import asyncio
+import json
+import logging
+import socket
+from concurrent.futures import ProcessPoolExecutor
+
+from .area_under_curve import ALGORITHMS, LOGGER, area_under_curve, uses_grid
+from .arguments import parse_commandline_arguments
+from .caches import RESULT_CACHE
+
+SERVER_INLINE_PANELS = 10000
+MAX_REQUEST_PANELS = 10 ** 8
+MIN_REQUEST_TOLERANCE = 1e-12
+
+# JSON request fields and the command line options they map to
+REQUEST_FIELDS = {"polynomial": "--polynomial", "lower": "--lower", "upper": "--upper",
+                  "step": "--step", "algorithm": "--algorithm", "tolerance": "--tolerance"}
+# Errors a malformed request can raise; these become error responses instead of aborting
+REQUEST_ERRORS = (TypeError, ValueError, OverflowError, ArithmeticError)
+
+class ErrorCollector(logging.Handler):
+    """Logging handler that keeps error messages instead of printing them"""
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+def request_arguments(request):
+    """Convert a request dictionary into command line arguments, or raise ValueError"""
+    if not isinstance(request, dict):
+        raise ValueError(f"Request must be an object: {request}")
+    unknown = set(request) - set(REQUEST_FIELDS) - {"id"}
+    if unknown:
+        raise ValueError(f"Unknown request fields: {', '.join(sorted(unknown))}")
+    argv = []
+    for field, option in REQUEST_FIELDS.items():
+        if field not in request:
+            continue
+        value = request[field]
+        if field == "algorithm" and ":" in str(value) and str(value) not in ALGORITHMS:
+            # module:function imports are for the command line only, not untrusted requests
+            raise ValueError(f"Requests can only use registered algorithms: {value}")
+        if field == "polynomial" and isinstance(value, dict):
+            # JSON keys are strings, so rebuild the dict literal with bare degrees
+            value = "{" + ", ".join(f"{degree}: {coefficient!r}"
+                                    for degree, coefficient in value.items()) + "}"
+        argv += [option, str(value)]
+    return argv
+
+def parse_request(request):
+    """Parse a request dictionary with the same validation as the command line, rejecting
+    grids of more than MAX_REQUEST_PANELS panels and tolerances below MIN_REQUEST_TOLERANCE.
+    Gauss-Legendre orders are capped by get_algorithm, so parsing is cheap enough for the
+    event loop.
+    Returns a tuple of (Parameters, None) or (None, error message)
+    """
+    try:
+        argv = request_arguments(request)
+    except ValueError as err:
+        return None, str(err)
+    collector = ErrorCollector()
+    LOGGER.addHandler(collector)
+    try:
+        parameters = parse_commandline_arguments(argv)
+    except REQUEST_ERRORS as err:
+        collector.messages.append(str(err))
+        parameters = None
+    finally:
+        LOGGER.removeHandler(collector)
+    if parameters is None:
+        return None, "; ".join(collector.messages) or "Invalid request"
+    if parameters.tolerance < MIN_REQUEST_TOLERANCE:
+        return None, f"Tolerance too small: {parameters.tolerance} < {MIN_REQUEST_TOLERANCE}"
+    panels = parameters.bounds.full_range.count - 1
+    if uses_grid(parameters.algorithm) and panels > MAX_REQUEST_PANELS:
+        return None, f"Too many panels: {panels} > {MAX_REQUEST_PANELS}"
+    return parameters, None
+
+def area_for_parameters(parameters, cache=RESULT_CACHE):
+    """Area for a Parameters object, looked up in and stored to cache if it is set"""
+    return area_under_curve(parameters.polynomial, parameters.bounds, parameters.algorithm,
+                            tolerance=parameters.tolerance, cache=cache)
+
+def load_request(line):
+    """Parse one JSON request line.  Returns a tuple of (Parameters or None, response
+    dictionary with the request id and any error)
+    """
+    try:
+        request = json.loads(line)
+    except ValueError as err:
+        return None, {"error": f"Invalid JSON: {err}"}
+    parameters, error = parse_request(request)
+    response = {"id": request["id"]} if isinstance(request, dict) and "id" in request else {}
+    if error:
+        response["error"] = error
+    return parameters, response
+
+def area_response(parameters, response, cache=RESULT_CACHE):
+    """Fill in the area for a parsed request, or the error if integration fails"""
+    try:
+        response["area"] = area_for_parameters(parameters, cache)
+        response["algorithm"] = parameters.algorithm.__name__
+    except REQUEST_ERRORS as err:
+        response["error"] = str(err)
+    return response
+
+def answer_batch(input_stream, output_stream):
+    """Answer JSON-lines requests from input_stream with one JSON response line each, in
+    order, one line at a time.  Blank lines are skipped.
+    """
+    for line in input_stream:
+        if not line.strip():
+            continue
+        parameters, response = load_request(line)
+        if parameters is not None:
+            area_response(parameters, response)
+        output_stream.write(json.dumps(response) + "\n")
+
+def is_heavy(parameters):
+    """True if a request should run in an executor instead of the event loop"""
+    algorithm = parameters.algorithm
+    if getattr(algorithm, "closed_form", False):
+        return False
+    return not uses_grid(algorithm) or len(parameters.bounds.full_range) > SERVER_INLINE_PANELS
+
+# Integration server
+def parse_address(address):
+    """Split unix:/path or host:port (or just port, on localhost) into a socket family and
+    an address
+    """
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+async def answer_request(line, executor):
+    """Answer one JSON request line with a response dictionary.  Heavy requests are looked
+    up in RESULT_CACHE here, since executor processes have caches of their own, and only
+    integrated in the executor if they miss.
+    """
+    parameters, response = load_request(line)
+    if parameters is None:
+        return response
+    if not is_heavy(parameters):
+        return area_response(parameters, response)
+    key = parameters.cache_key()
+    area = RESULT_CACHE.get(key)
+    if area is not None:
+        response["area"] = area
+        response["algorithm"] = parameters.algorithm.__name__
+        return response
+    loop = asyncio.get_running_loop()
+    response = await loop.run_in_executor(executor, area_response, parameters, response, None)
+    if "area" in response:
+        RESULT_CACHE.put(key, response["area"])
+    return response
+
+async def start_server(address, executor):
+    """Start an asyncio server that answers one JSON response line per JSON request line.
+    Connections are served concurrently, and heavy integrations run in executor.
+    """
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await answer_request(line, executor)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    family, target = parse_address(address)
+    if family == socket.AF_UNIX:
+        return await asyncio.start_unix_server(handle_connection, path=target)
+    return await asyncio.start_server(handle_connection, host=target[0], port=target[1])
+
+def serve(address):
+    """Run the integration server until interrupted"""
+    async def run():
+        with ProcessPoolExecutor() as executor:
+            server = await start_server(address, executor)
+            LOGGER.info("Serving on %s", address)
+            async with server:
+                await server.serve_forever()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+class AreaClient:
+    """Thin blocking client for the integration server"""
+    def __init__(self, address, timeout=None):
+        family, target = parse_address(address)
+        self.connection = socket.socket(family, socket.SOCK_STREAM)
+        self.connection.settimeout(timeout)
+        self.connection.connect(target)
+        self.stream = self.connection.makefile("rwb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def request(self, **fields):
+        """Send one request and return the response dictionary"""
+        self.stream.write(json.dumps(fields).encode() + b"\n")
+        self.stream.flush()
+        return json.loads(self.stream.readline())
+
+    def area(self, **fields):
+        """Send one request and return the area, raising ValueError on errors"""
+        response = self.request(**fields)
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["area"]
+
+    def close(self):
+        """Close the connection"""
+        self.stream.close()
+        self.connection.close()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Inverse solver:  the upper bound where the area reaches a target"""
+import math
+import sys
+
+from .area_under_curve import (DEFAULT_TOLERANCE, LOGGER, Bounds, FloatRange, integrate_bounds,
+                               integrate_points, uses_grid)
+from .steps import auto_step
+
+MAX_BRACKET_DOUBLINGS = 60
+MAX_SOLVER_ITERATIONS = 100
+MAX_SOLVER_PANELS = 10 ** 7
+
+def solve_upper_bound(poly, lower, target_area, algorithm, #pylint: disable=too-many-arguments,too-many-locals
+                      tol=DEFAULT_TOLERANCE, step=None, guess=None):
+    """Finds the x > lower where the area from lower to x, as computed by the algorithm,
+    reaches target_area to within tol.  The search doubles the distance from lower,
+    starting at guess (lower + 1 by default), until the area crosses the target, then
+    takes Newton steps, using the polynomial as the derivative of the area, and falls back
+    to bisection whenever a step leaves the bracket.  Every new area is the area already
+    known at the nearest previous point plus the area between the two, integrated with
+    the algorithm and the given step, or the step auto_step picks for tol.
+    Raises ValueError if the target can't be reached:  once the bracket is past
+    sign_bound, the area only moves away from a target it hasn't crossed.  Grid
+    algorithms also raise ValueError past a total of MAX_SOLVER_PANELS panels.
+    """
+    poly.check_domain(lower)
+    if target_area == 0:
+        return lower
+    known = {lower: 0.0}
+    panels_left = MAX_SOLVER_PANELS
+    def residual(x):
+        """Area from lower to x minus the target, extending the nearest known area"""
+        nonlocal panels_left
+        nearest = min(known, key=lambda point: abs(point - x))
+        start, stop = sorted((nearest, x))
+        panels = segment_panels(poly, start, stop, algorithm, tol, step)
+        if panels > panels_left:
+            raise ValueError(f"Area {target_area} not reached from {lower} within "
+                             f"{MAX_SOLVER_PANELS} panels")
+        panels_left -= panels
+        area = segment_area(poly, start, stop, algorithm, tol, step, panels)
+        known[x] = known[nearest] + area if nearest <= x else known[nearest] - area
+        return known[x] - target_area
+    bound, sign = sign_bound(poly)
+    low, low_residual = lower, -target_area
+    high = lower + 1.0 if guess is None or guess <= lower else guess
+    high_residual = residual(high)
+    for _ in range(MAX_BRACKET_DOUBLINGS):
+        if (high_residual > 0) != (low_residual > 0):
+            break
+        if high >= bound and (sign * high_residual > 0 or sign == 0):
+            raise ValueError(f"Area {target_area} not reached from {lower}:  the area "
+                             f"moves away from it past {high}")
+        low, low_residual = high, high_residual
+        high = lower + 2 * (high - lower)
+        high_residual = residual(high)
+    else:
+        raise ValueError(f"Area {target_area} not reached from {lower}, up to {high}")
+    x, x_residual = (low, low_residual) if abs(low_residual) < abs(high_residual) \
+        else (high, high_residual)
+    for _ in range(MAX_SOLVER_ITERATIONS):
+        if abs(x_residual) <= tol or high - low <= 4 * sys.float_info.epsilon * abs(x):
+            break
+        slope = poly.evaluate(x)
+        newton = x - x_residual / slope if slope else None
+        x = newton if newton is not None and low < newton < high else (low + high) / 2.0
+        x_residual = residual(x)
+        if (x_residual > 0) == (low_residual > 0):
+            low, low_residual = x, x_residual
+        else:
+            high, high_residual = x, x_residual
+    LOGGER.info("Upper bound for area %s from %s: %s", target_area, lower, x)
+    return x
+
+def sign_bound(poly):
+    """Tuple of (bound, sign) where sign is the sign of the leading coefficient, and the
+    polynomial has that sign everywhere above bound.  Above 1, each term other than the
+    leading c*x^n is at most |c_i|*x^m, for the next highest degree m, so the leading term
+    outweighs their sum S once x^(n-m) > S/|c|.  The zero polynomial has sign 0 everywhere.
+    """
+    terms = [(degree, coefficient) for degree, coefficient
+             in zip(poly.exponents, poly.coefficients) if coefficient != 0]
+    if not terms:
+        return -math.inf, 0
+    degree, coefficient = terms[-1]
+    sign = 1 if coefficient > 0 else -1
+    if len(terms) == 1:
+        return 0.0, sign
+    rest = math.fsum(abs(other) for _, other in terms[:-1]) / abs(coefficient)
+    return max(1.0, rest ** (1 / (degree - terms[-2][0]))), sign
+
+def segment_panels(poly, lower, upper, algorithm, #pylint: disable=too-many-arguments
+                   tol=DEFAULT_TOLERANCE, step=None):
+    """Number of whole panels no wider than step, or than the step auto_step picks for tol,
+    that segment_area integrates between lower and upper, 0 if the algorithm doesn't use a
+    grid
+    """
+    if upper <= lower or not uses_grid(algorithm):
+        return 0
+    if step is None:
+        step = auto_step(poly, lower, upper, algorithm, tol) \
+            if hasattr(algorithm, "error_bound") else upper - lower
+    return math.ceil((upper - lower) / step)
+
+def segment_area(poly, lower, upper, algorithm, #pylint: disable=too-many-arguments
+                 tol=DEFAULT_TOLERANCE, step=None, panels=None):
+    """Area between lower and upper with the algorithm, on a grid of whole panels no wider
+    than step, or of the given number of panels
+    """
+    if upper <= lower:
+        return 0.0
+    if not uses_grid(algorithm):
+        return integrate_bounds(poly, Bounds(lower, upper, upper - lower), algorithm,
+                                tolerance=tol)
+    if panels is None:
+        panels = segment_panels(poly, lower, upper, algorithm, tol, step)
+    return integrate_points(poly, FloatRange(lower, (upper - lower) / panels, panels + 1),
+                            algorithm)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Instrumentation:  opt-in evaluation counts and phase timings for area_under_curve"""
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+@dataclass
+class IntegrationStats:
+    """Opt-in counters and phase timings for area_under_curve.  If hook is set, it is
+    called as hook(phase, seconds, stats) at the end of the "integration" phase.
+    Evaluations are counted in this process only, not in worker processes.
+    """
+    integration_seconds: float = 0.0
+    evaluations: int = 0
+    panels: int = 0
+    hook: Optional[Callable] = None
+
+    def record(self, phase, seconds):
+        """Add the time spent in a phase and notify the hook"""
+        setattr(self, f"{phase}_seconds", getattr(self, f"{phase}_seconds") + seconds)
+        if self.hook is not None:
+            self.hook(phase, seconds, self)
+
+    def counting(self, poly):
+        """Wrap a polynomial so its evaluations are counted in these stats"""
+        return CountingPolynomial(poly, self)
+
+class CountingPolynomial:
+    """Wraps a polynomial and counts its evaluations in an IntegrationStats"""
+    def __init__(self, poly, stats):
+        self.poly = poly
+        self.stats = stats
+
+    def __getattr__(self, name):
+        if name == "poly":
+            raise AttributeError(name)
+        return getattr(self.poly, name)
+
+    def __reduce__(self):
+        """Pickle as the wrapped polynomial"""
+        return self.poly.__reduce__()
+
+    def __str__(self):
+        return str(self.poly)
+
+    def evaluate(self, value):
+        """Evaluate the wrapped polynomial at a given value"""
+        self.stats.evaluations += 1
+        return self.poly.evaluate(value)
+
+    def evaluate_array(self, values):
+        """Evaluate the wrapped polynomial at every value of a numpy array"""
+        self.stats.evaluations += values.size
+        return self.poly.evaluate_array(values)
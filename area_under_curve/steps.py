@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Step sizes picked a priori from the derivative error bounds of the algorithms"""
+import math
+
+from .area_under_curve import DEFAULT_TOLERANCE
+
+DERIVATIVE_BOUND_PIECES = 64
+
+def auto_step(poly, lower, upper, algorithm, tolerance=DEFAULT_TOLERANCE):
+    """Largest step size whose grid the algorithm's error_bound guarantees to integrate
+    to within tolerance.  The step divides [lower, upper] into a whole number of panels,
+    and is the whole interval if the bounded derivative is zero.
+    """
+    order, constant = algorithm.error_bound
+    poly.check_domain(lower)
+    try:
+        bound = derivative_bound(poly, order, lower, upper)
+    except ValueError as err:
+        raise ValueError(f"Can't bound derivative {order} of {poly} for "
+                         f"{algorithm.__name__}") from err
+    width = upper - lower
+    if bound == 0:
+        return width
+    step = (tolerance / (constant * width * bound)) ** (1 / order)
+    return width / math.ceil(width / step)
+
+def derivative_bound(poly, order, lower, upper, pieces=DERIVATIVE_BOUND_PIECES):
+    """Upper bound of |f^(order)| on [lower, upper].  On each of pieces equal pieces the
+    derivative is bounded term by term, |c*x^n| <= |c|*max(|left|, |right|)^n, or by its
+    value at the center plus half the width times the same bound of its slope, whichever
+    is smaller.  Raises ValueError if a derivative needs negative exponents.
+    """
+    for _ in range(order):
+        poly = poly.derivative()
+    try:
+        slope = poly.derivative()
+    except ValueError:
+        slope = None
+    def term_bound(derivative, reach):
+        return math.fsum(abs(coefficient) * reach ** degree for degree, coefficient
+                         in zip(derivative.exponents, derivative.coefficients))
+    width = (upper - lower) / pieces
+    bound = 0.0
+    for index in range(pieces):
+        left = lower + index * width
+        right = left + width
+        reach = max(abs(left), abs(right))
+        piece_bound = term_bound(poly, reach)
+        if slope is not None:
+            piece_bound = min(piece_bound, abs(poly.evaluate((left + right) / 2.0))
+                              + width / 2.0 * term_bound(slope, reach))
+        bound = max(bound, piece_bound)
+    return bound
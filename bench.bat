@@ -0,0 +1 @@
+python -m benchmarks.benchmark %*
@@ -0,0 +1,3 @@
+#!/usr/bin/env python
+"""Benchmarks for the area_under_curve hot path"""
+__title__ = 'benchmarks'
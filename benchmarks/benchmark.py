@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""Benchmark sweep of area_under_curve, Bounds.float_range, and Polynomial.evaluate over
+polynomial degree, sparsity, integer and fractional exponents, step size, and every
+registered algorithm.  Reports wall time, evaluations per second, and peak memory, writes
+the results as a JSON baseline, and flags regressions against a previous baseline.
+
+Usage: python -m benchmarks.benchmark [-q|--quick] [-o|--output <file>]
+    [-b|--baseline <file>] [-t|--threshold <fraction>]
+  defaults: output:benchmark.json, threshold:0.25
+"""
+import getopt
+import json
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, '../area_under_curve/')
+import area_under_curve as auc # pylint: disable=wrong-import-position
+
+POLYNOMIALS = {
+    "dense_degree_2": {2:3, 1:4, 0:5},
+    "dense_degree_8": {degree: degree + 1 for degree in range(9)},
+    "dense_degree_32": {degree: 1 for degree in range(33)},
+    "sparse_degree_1000": {1000:1, 999:3, 0:2},
+    "fractional": {.5:1, 1.5:2, 2.5:1},
+}
+STEPS = [1e-1, 1e-2, 1e-3, 1e-4, 1e-5, 1e-6]
+QUICK_STEPS = [1e-1, 1e-2, 1e-3, 1e-4]
+LOWER = 0
+UPPER = 1
+EVALUATE_CALLS = 100000
+REPEAT = 3
+DEFAULT_OUTPUT = "benchmark.json"
+DEFAULT_THRESHOLD = .25
+
+
+def measure(function):
+    """Best wall time of REPEAT calls, then peak traced memory of one more call"""
+    seconds = min(timed(function) for _ in range(REPEAT))
+    tracemalloc.start()
+    function()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak_bytes
+
+def timed(function):
+    """Wall time of one call"""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def result(seconds, peak_bytes, evaluations):
+    """Result record for one benchmark case"""
+    return {"seconds": seconds, "peak_bytes": peak_bytes, "evaluations": evaluations,
+            "evaluations_per_second": evaluations / seconds if seconds else 0}
+
+def benchmark_area(coefficients, step, algorithm):
+    """Benchmark one area_under_curve call"""
+    bounds = auc.Bounds(LOWER, UPPER, step)
+    polynomial = auc.Polynomial(coefficients)
+    stats = auc.IntegrationStats()
+    auc.area_under_curve(polynomial, bounds, algorithm, stats=stats)
+    evaluations = stats.evaluations
+    seconds, peak_bytes = measure(lambda: auc.area_under_curve(polynomial, bounds, algorithm))
+    return result(seconds, peak_bytes, evaluations)
+
+def benchmark_bounds(step):
+    """Benchmark building a Bounds grid"""
+    seconds, peak_bytes = measure(lambda: auc.Bounds(LOWER, UPPER, step))
+    return result(seconds, peak_bytes, 0)
+
+def benchmark_evaluate(coefficients):
+    """Benchmark EVALUATE_CALLS scalar evaluations"""
+    polynomial = auc.Polynomial(coefficients)
+    values = [LOWER + (UPPER - LOWER) * index / EVALUATE_CALLS
+              for index in range(EVALUATE_CALLS)]
+    def evaluate_all():
+        for value in values:
+            polynomial.evaluate(value)
+    seconds, peak_bytes = measure(evaluate_all)
+    return result(seconds, peak_bytes, EVALUATE_CALLS)
+
+def run_benchmarks(steps):
+    """Run the full sweep and return results by case name"""
+    results = {}
+    for step in steps:
+        results[f"bounds/step={step:g}"] = benchmark_bounds(step)
+    for name, coefficients in POLYNOMIALS.items():
+        results[f"evaluate/{name}"] = benchmark_evaluate(coefficients)
+        for algorithm_name in auc.list_algorithms():
+            algorithm = auc.get_algorithm(algorithm_name)
+            if not auc.uses_grid(algorithm):
+                # step size is ignored, so one run is enough
+                results[f"area/{name}/{algorithm_name}"] = benchmark_area(coefficients,
+                                                                          steps[0], algorithm)
+                continue
+            for step in steps:
+                results[f"area/{name}/{algorithm_name}/step={step:g}"] = \
+                    benchmark_area(coefficients, step, algorithm)
+    return results
+
+def compare_results(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """List regressions where wall time or peak memory grew by more than threshold"""
+    regressions = []
+    for case, current in results.items():
+        previous = baseline.get(case)
+        if previous is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(f"{case}: {metric} {previous[metric]:.6g} -> "
+                                   f"{current[metric]:.6g}")
+    return regressions
+
+def print_results(results):
+    """Print one line per case"""
+    for case, current in results.items():
+        print(f"{case:55} {current['seconds'] * 1000:12.3f} ms "
+              f"{current['evaluations_per_second']:14.0f} evals/s "
+              f"{current['peak_bytes'] / 1024:10.1f} KiB")
+
+def main(argv):
+    """Command-line entrypoint"""
+    steps = STEPS
+    output = DEFAULT_OUTPUT
+    baseline_path = None
+    threshold = DEFAULT_THRESHOLD
+    try:
+        opts, _ = getopt.getopt(argv, "qo:b:t:", ["quick", "output=", "baseline=", "threshold="])
+    except getopt.GetoptError as err:
+        print(f"Option error: {str(err)}\n{__doc__}")
+        return 2
+    for opt, arg in opts:
+        if opt in ("-q", "--quick"):
+            steps = QUICK_STEPS
+        elif opt in ("-o", "--output"):
+            output = arg
+        elif opt in ("-b", "--baseline"):
+            baseline_path = arg
+        elif opt in ("-t", "--threshold"):
+            threshold = float(arg)
+    results = run_benchmarks(steps)
+    print_results(results)
+    with open(output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=1, sort_keys=True)
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as baseline_file:
+            regressions = compare_results(results, json.load(baseline_file), threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
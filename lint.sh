@@ -1,5 +1,19 @@
 #! /bin/bash
 
 pylint area_under_curve/area_under_curve.py
+pylint area_under_curve/caches.py
+pylint area_under_curve/stats.py
+pylint area_under_curve/steps.py
+pylint area_under_curve/batch.py
+pylint area_under_curve/cumulative.py
+pylint area_under_curve/solver.py
+pylint area_under_curve/samples.py
+pylint area_under_curve/arguments.py
+pylint area_under_curve/server.py
+pylint area_under_curve/cli.py
 pylint tests/demo.py
-pylint tests/unit_test.py
\ No newline at end of file
+pylint tests/unit_test.py
+pylint tests/server_test.py
+pylint tests/cumulative_test.py
+pylint tests/samples_test.py
+pylint benchmarks/benchmark.py
@@ -26,5 +26,6 @@ setup(name='area_under_curve',
       ],
 
       packages=['area_under_curve'],
+      extras_require={'numpy': ['numpy']},
       keywords='riemann-sum calculus',
       zip_safe=False)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""Unit tests for the cumulative area index"""
+import os
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, '..')
+import area_under_curve as auc # pylint: disable=wrong-import-position
+
+
+class CumulativeAreaTest(unittest.TestCase):
+    """Test class for the cumulative area index"""
+    def setUp(self):
+        self.polynomial = auc.Polynomial({3:1, 1:-2, 0:1})
+        self.bounds = auc.Bounds(0, 10, .01)
+
+    def test_queries(self):
+        """grid-aligned and partial-panel queries match integrating each range"""
+        for name in ("trapezoid", "simpson", "gauss"):
+            algorithm = auc.get_algorithm(name)
+            index = auc.CumulativeArea(self.polynomial, self.bounds, algorithm)
+            self.assertAlmostEqual(index.area(0, 10), auc.area_under_curve(
+                self.polynomial, self.bounds, algorithm), places=9)
+            self.assertAlmostEqual(index.area(2, 5), auc.area_under_curve(
+                self.polynomial, auc.Bounds(2, 5, .01), algorithm), places=9)
+        index = auc.CumulativeArea(self.polynomial, self.bounds, auc.get_algorithm("simpson"))
+        for lower, upper in ((1.2345, 7.891), (3.001, 3.004), (4, 4)):
+            self.assertAlmostEqual(index.area(lower, upper),
+                                   self.polynomial.integrate(lower, upper), places=9)
+        with self.assertRaises(ValueError):
+            index.area(-1, 2)
+
+    def test_pure_python(self):
+        """the array('d') index matches the vectorized one"""
+        algorithm = auc.get_algorithm("midpoint")
+        index = auc.CumulativeArea(self.polynomial, self.bounds, algorithm, vectorize=False)
+        self.assertAlmostEqual(index.area(.5, 9.5), auc.CumulativeArea(
+            self.polynomial, self.bounds, algorithm).area(.5, 9.5), places=9)
+
+    def test_save_load(self):
+        """a saved index memory-maps back for the same polynomial and algorithm only"""
+        algorithm = auc.get_algorithm("simpson")
+        index = auc.CumulativeArea(self.polynomial, self.bounds, algorithm)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.bin")
+            index.save(path)
+            loaded = auc.CumulativeArea.load(path, self.polynomial, algorithm)
+            assert loaded.area(1.5, 8.25) == index.area(1.5, 8.25)
+            with self.assertRaises(ValueError):
+                auc.CumulativeArea.load(path, auc.Polynomial({3:1}), algorithm)
+            del loaded
+
+
+if __name__ == "__main__":
+    unittest.main()
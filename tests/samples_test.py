@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Unit tests for tabulated samples"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, '..')
+import area_under_curve as auc # pylint: disable=wrong-import-position
+
+
+@unittest.skipIf(auc.numpy is None, "numpy not installed")
+class SamplesTest(unittest.TestCase):
+    """Test class for tabulated sample integration"""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # 24 unevenly spaced samples of y = x^2 on [0, 2], an odd number of intervals
+        self.x = auc.numpy.linspace(0, 1, 24) ** 2 * 2
+        self.y = self.x ** 2
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_binary(self):
+        """Write the samples as binary float64 pairs"""
+        path = os.path.join(self.directory, "samples.bin")
+        auc.numpy.column_stack([self.x, self.y]).tofile(path)
+        return path
+
+    def test_uneven_rules(self):
+        """uneven Simpson is exact for parabolas, trapezoid for lines"""
+        simpson = auc.get_algorithm("simpson")
+        self.assertAlmostEqual(simpson.samples(self.x, self.y), 8 / 3, places=12)
+        self.assertAlmostEqual(simpson.samples(self.x[:2], self.y[:2]), self.y[1] * self.x[1] / 2)
+        trapezoid = auc.get_algorithm("trapezoid")
+        self.assertAlmostEqual(trapezoid.samples(self.x, 3 * self.x + 1), 8, places=12)
+
+    def test_binary_chunks_and_workers(self):
+        """memory-mapped chunks and worker counts give the same answer"""
+        path = self.write_binary()
+        simpson = auc.get_algorithm("simpson")
+        areas = {auc.area_under_samples(path, simpson, workers, chunk_size=7)
+                 for workers in (None, 2)}
+        assert len(areas) == 1
+        self.assertAlmostEqual(areas.pop(), 8 / 3, places=12)
+
+    def test_binary_partial_pair(self):
+        """a binary file with an odd number of floats is rejected with a clear error"""
+        path = os.path.join(self.directory, "odd.bin")
+        auc.numpy.arange(5, dtype=float).tofile(path)
+        with self.assertRaisesRegex(ValueError, "40 bytes"):
+            auc.area_under_samples(path, auc.get_algorithm("trapezoid"))
+
+    def test_text_matches_binary(self):
+        """streamed CSV chunks with a header match the memory-mapped file"""
+        path = os.path.join(self.directory, "samples.csv")
+        with open(path, "w", encoding="utf-8") as samples:
+            samples.write("x,y\n")
+            samples.writelines(f"{x!r},{y!r}\n"
+                               for x, y in zip(self.x.tolist(), self.y.tolist()))
+        trapezoid = auc.get_algorithm("trapezoid")
+        assert auc.area_under_samples(path, trapezoid, chunk_size=5) == \
+            auc.area_under_samples(self.write_binary(), trapezoid, chunk_size=5)
+
+    def test_samples_argument(self):
+        """command line samples mode"""
+        path = self.write_binary()
+        parsed_params = auc.parse_commandline_arguments(["-f", path, "-a", "simpson"])
+        assert parsed_params.samples_path == path
+        assert auc.parse_commandline_arguments(["--samples", path, "-a", "midpoint"]) is None
+        auc.area_under_curve_argv(["area_under_curve.py", "--samples", path])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""Unit tests for JSON-lines requests, batch mode, and the server"""
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+sys.path.insert(0, '..')
+import area_under_curve as auc # pylint: disable=wrong-import-position
+
+
+class ServerTest(unittest.TestCase):
+    """Test class for the integration server and client"""
+    def test_parse_request(self):
+        """requests are validated like command line arguments"""
+        parameters, error = auc.parse_request({"polynomial": {"3": 2}, "step": .5,
+                                               "algorithm": "midpoint"})
+        assert error is None
+        assert parameters.polynomial.coefficient_dict == {3:2}
+        assert parameters.bounds.step_size == .5
+        _, error = auc.parse_request({"polynomial": "{1.5:2}", "lower": -1})
+        assert "Fractional" in error
+        _, error = auc.parse_request({"polynomial": "{3:2}", "help": True})
+        assert "help" in error
+
+    def test_server_roundtrip(self):
+        """client requests are answered in order, errors on the failing request"""
+        with tempfile.TemporaryDirectory() as directory:
+            address = "unix:" + os.path.join(directory, "auc.sock")
+            loop = asyncio.new_event_loop()
+            executor = ThreadPoolExecutor(2)
+            server = loop.run_until_complete(auc.start_server(address, executor))
+            thread = threading.Thread(target=loop.run_forever)
+            thread.start()
+            try:
+                with auc.AreaClient(address, timeout=10) as client:
+                    area = client.area(polynomial={"3": 1}, step=.1, algorithm="simpson")
+                    self.assertAlmostEqual(area, 2500)
+                    area = client.area(polynomial="{2:1}", step=1e-4, algorithm="trapezoid")
+                    self.assertAlmostEqual(area, 1000 / 3)
+                    response = client.request(id=7, polynomial="{a}")
+                    assert response["id"] == 7
+                    assert "error" in response
+                    with self.assertRaises(ValueError):
+                        client.area(polynomial="{3:1}", lower=5, upper=1)
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                server.close()
+                loop.run_until_complete(server.wait_closed())
+                loop.close()
+                executor.shutdown()
+
+    def test_heavy_request_cache(self):
+        """heavy requests are cached in the server process, not in the executor's"""
+        line = '{"polynomial": {"4": 1}, "algorithm": "adaptive", "tolerance": 1e-7}'
+        auc.RESULT_CACHE.clear()
+        executor = ProcessPoolExecutor(1)
+        try:
+            response = asyncio.run(auc.answer_request(line, executor))
+        finally:
+            executor.shutdown()
+        self.assertAlmostEqual(response["area"], 20000)
+        assert len(auc.RESULT_CACHE) == 1
+        # The executor is shut down, so only a cache hit can answer the request
+        assert asyncio.run(auc.answer_request(line, executor)) == response
+        assert auc.RESULT_CACHE.hits == 1
+        auc.RESULT_CACHE.clear()
+
+class BatchModeTest(unittest.TestCase):
+    """Test class for JSON-lines batch mode"""
+    def test_answer_batch(self):
+        """one response per request, in order, with errors on the failing line"""
+        requests = io.StringIO("\n".join([
+            '{"polynomial": {"3": 1}, "step": 0.1, "algorithm": "simpson"}',
+            '',
+            '{"polynomial": "{3:1}", "step": -1}',
+            'not json',
+            '{"id": "q4", "polynomial": "{2:1}", "algorithm": "exact"}']))
+        output = io.StringIO()
+        auc.answer_batch(requests, output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert len(responses) == 4
+        self.assertAlmostEqual(responses[0]["area"], 2500)
+        assert "step size" in responses[1]["error"]
+        assert "Invalid JSON" in responses[2]["error"]
+        assert responses[3]["id"] == "q4"
+        self.assertAlmostEqual(responses[3]["area"], 1000 / 3)
+
+    def test_malformed_requests(self):
+        """type, overflow and call errors become error responses instead of aborting"""
+        requests = io.StringIO("\n".join([
+            '{"polynomial": "{\\"a\\": 1}"}',
+            '{"polynomial": "{1:1}", "upper": "inf"}',
+            '{"polynomial": "{1:1}", "algorithm": "json:dumps"}',
+            '{"polynomial": "{1:1}"}']))
+        output = io.StringIO()
+        auc.answer_batch(requests, output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert len(responses) == 4
+        for response in responses[:3]:
+            assert "error" in response and "area" not in response
+        self.assertAlmostEqual(responses[3]["area"], 50)
+
+    def test_request_import(self):
+        """requests can't import module:function algorithms, even callable ones"""
+        for name in ("json:dumps", "unit_test:left_rectangle", "area_under_curve:midpoint"):
+            parameters, error = auc.parse_request({"polynomial": "{1:1}", "algorithm": name})
+            assert parameters is None
+            assert "registered" in error
+        parameters, error = auc.parse_request({"polynomial": "{1:1}", "algorithm": "gauss3"})
+        assert error is None and parameters.algorithm.order == 3
+
+    def test_request_panels(self):
+        """requests over MAX_REQUEST_PANELS are rejected before integrating"""
+        for request in ({"polynomial": "{1:1}", "step": 1e-300},
+                        {"polynomial": "{1:1}", "upper": 1e300}):
+            parameters, error = auc.parse_request(request)
+            assert parameters is None
+            assert "Too many panels" in error
+        parameters, error = auc.parse_request(
+            {"polynomial": "{1:1}", "upper": 1e300, "algorithm": "exact"})
+        assert error is None and parameters is not None
+
+    def test_request_cost(self):
+        """non-finite and tiny tolerances and huge Gauss orders are rejected when parsing"""
+        requests = io.StringIO("\n".join([
+            '{"polynomial": "{4:1}", "algorithm": "adaptive", "tolerance": NaN}',
+            '{"polynomial": "{4:1}", "algorithm": "romberg", "tolerance": Infinity}',
+            '{"polynomial": "{4:1}", "algorithm": "adaptive", "tolerance": 1e-300}',
+            '{"polynomial": "{4:1}", "algorithm": "gauss100000"}']))
+        output = io.StringIO()
+        auc.answer_batch(requests, output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert "finite" in responses[0]["error"]
+        assert "finite" in responses[1]["error"]
+        assert "Tolerance too small" in responses[2]["error"]
+        assert "order" in responses[3]["error"]
+
+    def test_entrypoint_batch(self):
+        """command line batch mode reads a file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "requests.jsonl")
+            with open(path, "w", encoding="utf-8") as requests:
+                requests.write('{"polynomial": "{1:1}"}\n')
+            auc.area_under_curve_argv(["area_under_curve.py", "--batch", path])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
 #!/usr/bin/env python
 """Unit tests"""
 import math
+import os
 import sys
+import tempfile
 import unittest
-sys.path.insert(0, '../area_under_curve/')
+import unittest.mock
+sys.path.insert(0, '..')
 import area_under_curve as auc # pylint: disable=wrong-import-position
 
 
@@ -34,6 +37,30 @@ class BoundsTest(unittest.TestCase):
         assert len(bounds_ok.full_range) == 6 #[0,1,2,3,4,5]
 
 
+    def test_bounds_lazy_range(self):
+        """grid points are computed from the index instead of accumulated"""
+        bounds = auc.Bounds(0, 1, 1e-7)
+        assert len(bounds.full_range) == 10000001
+        assert bounds.full_range[3] == 3 * 1e-7
+        assert bounds.full_range[-1] == 10000000 * 1e-7
+        with self.assertRaises(IndexError):
+            bounds.full_range[10000001] # pylint: disable=pointless-statement
+        with self.assertRaises(TypeError):
+            bounds.full_range[1.5] # pylint: disable=pointless-statement
+
+    def test_bounds_range_slice(self):
+        """slicing returns a lazy sub-range"""
+        bounds = auc.Bounds(0, 5, 1)
+        assert list(bounds.full_range[1:4]) == [1, 2, 3]
+        assert list(bounds.full_range[::2]) == [0, 2, 4]
+        assert list(bounds.full_range) == [0, 1, 2, 3, 4, 5]
+
+    def test_bounds_range_chunks(self):
+        """chunks share boundary points and cover the whole range"""
+        bounds = auc.Bounds(0, 5, 1)
+        chunks = [list(chunk) for chunk in bounds.full_range.chunks(3)]
+        assert chunks == [[0, 1, 2], [2, 3, 4], [4, 5]]
+
     def test_bad_step_size(self):
         """reject invalid step size"""
         with self.assertRaises(ValueError):
@@ -103,6 +130,21 @@ class PolynomialTest(unittest.TestCase):
             polynomial_reject_fraction = auc.Polynomial({2.5:1})
             polynomial_reject_fraction.evaluate(-2)
 
+    def test_dense_horner(self):
+        """dense polynomial with a missing term matches term-by-term evaluation"""
+        polynomial = auc.Polynomial({5:1, 4:-2, 2:3, 0:1})
+        expected = sum(math.pow(-1.3, degree) * coefficient
+                       for degree, coefficient in polynomial.coefficient_dict.items())
+        self.assertAlmostEqual(polynomial.evaluate(-1.3), expected)
+
+    def test_sparse_horner(self):
+        """sparse high-degree polynomial matches term-by-term evaluation"""
+        polynomial = auc.Polynomial({1000:1, 999:3, 0:2})
+        expected = math.pow(1.001, 1000) + 3 * math.pow(1.001, 999) + 2
+        self.assertAlmostEqual(polynomial.evaluate(1.001), expected)
+        assert polynomial.evaluate(-1) == 0
+        assert auc.Polynomial({7:2}).evaluate(2) == 256
+
     def test_negative_exp_reject(self):
         """reject negative exponents"""
         with self.assertRaises(ValueError):
@@ -114,6 +156,45 @@ class PolynomialTest(unittest.TestCase):
             auc.Polynomial({-2.5: 1})
 
 
+class PolynomialAlgebraTest(unittest.TestCase):
+    """Test class for immutable polynomial algebra"""
+    def test_immutable(self):
+        """terms can't be changed after construction"""
+        coefficients = {2:3, 0:1}
+        polynomial = auc.Polynomial(coefficients)
+        coefficients[2] = 4
+        polynomial.coefficient_dict[2] = 5
+        assert polynomial.exponents == (0, 2) and polynomial.coefficients == (1, 3)
+        with self.assertRaises(AttributeError):
+            polynomial.coefficients = (1, 4)
+        with self.assertRaises(AttributeError):
+            polynomial.terms = {}
+
+    def test_arithmetic(self):
+        """sums, products, and scaling"""
+        first = auc.Polynomial({1:1, 0:1})
+        second = auc.Polynomial({1:1, 0:-1})
+        assert (first * second).coefficient_dict == {2:1, 0:-1}
+        assert (first + second).coefficient_dict == {1:2}
+        assert (2 * first + 1).coefficient_dict == {1:2, 0:3}
+        assert str(first * 3) == "f(x)=3x + 3"
+        assert (first * auc.Polynomial({.5:2})).coefficient_dict == {1.5:2, .5:2}
+
+    def test_derivative(self):
+        """derivatives, and rejecting exponents between 0 and 1"""
+        assert auc.Polynomial({3:1, 1:4, 0:2}).derivative().coefficient_dict == {2:3, 0:4}
+        assert auc.Polynomial({2.5:2}).derivative().coefficient_dict == {1.5:5}
+        with self.assertRaises(ValueError):
+            auc.Polynomial({.5:1}).derivative()
+
+    def test_equality_hash(self):
+        """equal terms compare and hash equal, ignoring zero terms"""
+        assert auc.Polynomial({1:1}) == auc.Polynomial({1:1.0, 0:0})
+        assert auc.Polynomial({1:1}) != auc.Polynomial({1:2})
+        areas = {auc.Polynomial({2:1}): 1}
+        assert areas[auc.Polynomial({2:1.0})] == 1
+
+
 class ParseArgumentsTest(unittest.TestCase):
     """Test class for parsing command line arguments """
     def test_ok(self):
@@ -230,6 +311,658 @@ class AreaTest(unittest.TestCase):
         self.assertAlmostEqual(area, 0)
 
 
+class VectorizedTest(unittest.TestCase):
+    """Test class for the numpy-vectorized integration path"""
+    def check_matches_scalar(self, coefficients, lower, upper, step):
+        """vectorized and pure-python results agree for every algorithm"""
+        bounds = auc.Bounds(lower, upper, step)
+        polynomial = auc.Polynomial(coefficients)
+        for name in ("midpoint", "trapezoid", "simpson"):
+            algorithm = auc.get_algorithm(name)
+            vector_area = auc.area_under_curve(polynomial, bounds, algorithm)
+            scalar_area = auc.area_under_curve(polynomial, bounds, algorithm, vectorize=False)
+            self.assertAlmostEqual(vector_area, scalar_area, places=6)
+
+    @unittest.skipIf(auc.numpy is None, "numpy not installed")
+    def test_vectorized_matches_scalar(self):
+        """integer exponents"""
+        self.check_matches_scalar({3:1, 1:-2, 0:4}, -5, 5, .01)
+
+    @unittest.skipIf(auc.numpy is None, "numpy not installed")
+    def test_vectorized_fractional(self):
+        """fractional exponents"""
+        self.check_matches_scalar({1.5:2, .5:1}, 0, 10, .01)
+
+    @unittest.skipIf(auc.numpy is None, "numpy not installed")
+    def test_vectorized_chunks(self):
+        """grids larger than one chunk are summed across chunk boundaries"""
+        self.check_matches_scalar({2:1}, 0, 10, 1e-4)
+
+    @unittest.skipIf(auc.numpy is None, "numpy not installed")
+    def test_vectorized_fraction_reject(self):
+        """reject negative input with fractional exponents"""
+        with self.assertRaises(ValueError):
+            auc.Polynomial({2.5:1}).evaluate_array(auc.numpy.array([-2.0]))
+
+def counting_polynomial(coefficient_dict):
+    """Polynomial that counts its evaluations in polynomial.stats"""
+    return auc.CountingPolynomial(auc.Polynomial(coefficient_dict), auc.IntegrationStats())
+
+
+class CompositeTest(unittest.TestCase):
+    """Test class for shared-node composite rules"""
+    def test_composite_matches_panels(self):
+        """composite rules give the same answer as summing single panels"""
+        bounds = auc.Bounds(-2, 3, .05)
+        polynomial = auc.Polynomial({4:1, 1:-3, 0:2})
+        points = bounds.full_range
+        for name in ("midpoint", "trapezoid", "simpson"):
+            algorithm = auc.get_algorithm(name)
+            panels = sum(algorithm(polynomial, lower, upper)
+                         for lower, upper in zip(points, points[1:]))
+            self.assertAlmostEqual(algorithm.composite(polynomial, points), panels)
+
+    def test_composite_evaluation_counts(self):
+        """each node is evaluated once"""
+        points = auc.Bounds(0, 10, 1).full_range
+        expected = {"midpoint": 10, "trapezoid": 11, "simpson": 21}
+        for name, count in expected.items():
+            polynomial = counting_polynomial({2:1})
+            auc.get_algorithm(name).composite(polynomial, points)
+            assert polynomial.stats.evaluations == count
+
+class AdaptiveTest(unittest.TestCase):
+    """Test class for adaptive Simpson quadrature"""
+    def test_adaptive_fractional(self):
+        """reaches the tolerance on a curve with a singular derivative"""
+        polynomial = counting_polynomial({.5:1})
+        area, evaluations = auc.adaptive_simpson(polynomial, 0, 10, 1e-8)
+        self.assertAlmostEqual(area, 10 * math.sqrt(10) / 1.5, places=6)
+        assert evaluations == polynomial.stats.evaluations
+        assert evaluations < 10000
+
+    def test_adaptive_cubic(self):
+        """simpson is exact for cubics, so no refinement is needed"""
+        area, evaluations = auc.adaptive_simpson(auc.Polynomial({3:1}), 0, 10)
+        self.assertAlmostEqual(area, 2500)
+        assert evaluations == 5
+
+    def test_adaptive_precision(self):
+        """tolerances below floating point precision stop at that precision"""
+        polynomial = auc.Polynomial({5:1, 4:-2, 3:1, 1:3, 0:-7})
+        area, evaluations = auc.adaptive_simpson(polynomial, -3, 7, 1e-300)
+        self.assertAlmostEqual(area, polynomial.integrate(-3, 7), places=8)
+        assert evaluations < 10000
+
+    def test_adaptive_area(self):
+        """area_under_curve ignores the step size for adaptive algorithms"""
+        algorithm = auc.get_algorithm("adaptive")
+        area = auc.area_under_curve(auc.Polynomial({4:1}), auc.Bounds(0, 2, 1), algorithm,
+                                    tolerance=1e-10)
+        self.assertAlmostEqual(area, 32 / 5)
+
+    def test_adaptive_arguments(self):
+        """parse tolerance argument"""
+        parsed_params = auc.parse_commandline_arguments(["-p", "{3:2}", "-a", "adaptive",
+                                                         "-t", "1e-6"])
+        assert parsed_params.tolerance == 1e-6
+        assert auc.parse_commandline_arguments(["-p", "{3:2}", "-t", "0"]) is None
+        assert auc.parse_commandline_arguments(["-p", "{3:2}", "-t", "nan"]) is None
+        assert auc.parse_commandline_arguments(["-p", "{3:2}", "-t", "inf"]) is None
+
+class RombergTest(unittest.TestCase):
+    """Test class for Romberg integration"""
+    def test_romberg_quartic(self):
+        """converges in a few levels for smooth polynomials"""
+        polynomial = counting_polynomial({4:1, 1:-3, 0:2})
+        tableau, evaluations = auc.romberg_tableau(polynomial, -1, 2, 1e-10)
+        self.assertAlmostEqual(tableau[-1][-1], 33 / 5 - 4.5 + 6)
+        assert evaluations == polynomial.stats.evaluations
+        assert evaluations < 20
+        assert [len(row) for row in tableau] == list(range(1, len(tableau) + 1))
+
+    def test_romberg_linear(self):
+        """trapezoid is exact for lines, so romberg stops at the minimum depth"""
+        area, evaluations = auc.romberg_integrate(auc.Polynomial({1:1}), 0, 10)
+        assert area == 50
+        assert evaluations == 2 ** auc.MIN_ROMBERG_LEVELS + 1
+
+    def test_romberg_vanishing_grids(self):
+        """a polynomial that is zero on the first grids doesn't stop romberg early"""
+        polynomial = auc.Polynomial({4:1, 2:-1})
+        area, _ = auc.romberg_integrate(polynomial, -1, 1)
+        self.assertAlmostEqual(area, -4 / 15)
+        area = auc.area_under_curve(polynomial, auc.Bounds(-1, 1, .5),
+                                    auc.get_algorithm("romberg"))
+        self.assertAlmostEqual(area, -4 / 15)
+
+    def test_romberg_area(self):
+        """area_under_curve ignores the step size for romberg"""
+        algorithm = auc.get_algorithm("romberg")
+        area = auc.area_under_curve(auc.Polynomial({.5:1}), auc.Bounds(0, 10, 1), algorithm,
+                                    tolerance=1e-6)
+        self.assertAlmostEqual(area, 10 * math.sqrt(10) / 1.5, places=5)
+
+
+class GaussTest(unittest.TestCase):
+    """Test class for Gauss-Legendre quadrature"""
+    def test_gauss_table(self):
+        """nodes and weights are computed once per order"""
+        nodes, weights = auc.legendre_nodes_weights(3)
+        self.assertAlmostEqual(nodes[2], math.sqrt(3 / 5))
+        self.assertAlmostEqual(weights[1], 8 / 9)
+        assert auc.legendre_nodes_weights(3) is auc.GAUSS_LEGENDRE_TABLE[3]
+
+    def test_gauss_exact_degree(self):
+        """n nodes integrate degree 2n-1 exactly on a single panel"""
+        polynomial = auc.Polynomial({9:1, 4:-2, 0:1})
+        algorithm = auc.get_algorithm("gauss5")
+        self.assertAlmostEqual(algorithm(polynomial, -1, 2), polynomial.integrate(-1, 2))
+        area = auc.area_under_curve(polynomial, auc.Bounds(-1, 2, .5), algorithm,
+                                    vectorize=False)
+        self.assertAlmostEqual(area, polynomial.integrate(-1, 2))
+
+    @unittest.skipIf(auc.numpy is None, "numpy not installed")
+    def test_gauss_vectorized(self):
+        """vectorized and batch paths match the per-panel path"""
+        polynomial = auc.Polynomial({12:1, .5:3})
+        bounds = auc.Bounds(0, 1.5, .01)
+        algorithm = auc.get_algorithm("gauss")
+        expected = auc.area_under_curve(polynomial, bounds, algorithm, vectorize=False)
+        self.assertAlmostEqual(auc.area_under_curve(polynomial, bounds, algorithm), expected)
+        self.assertAlmostEqual(auc.area_under_curve_batch([(polynomial, bounds, algorithm)])[0],
+                               expected)
+
+    def test_gauss_argument(self):
+        """parse gauss algorithm names"""
+        parsed_params = auc.parse_commandline_arguments(["-p", "{3:2}", "-a", "gauss3"])
+        assert parsed_params.algorithm == auc.GaussLegendre(3)
+        assert auc.parse_commandline_arguments(["-p", "{3:2}", "-a", "gauss0"]) is None
+
+    def test_gauss_max_order(self):
+        """orders above MAX_GAUSS_ORDER are rejected before any nodes are computed"""
+        assert auc.get_algorithm(f"gauss{auc.MAX_GAUSS_ORDER}").order == auc.MAX_GAUSS_ORDER
+        assert auc.get_algorithm(f"gauss{auc.MAX_GAUSS_ORDER + 1}") is None
+        assert auc.get_algorithm("gauss100000") is None
+        assert auc.MAX_GAUSS_ORDER + 1 not in auc.GAUSS_LEGENDRE_TABLE
+        with self.assertRaises(ValueError):
+            auc.GaussLegendre(auc.MAX_GAUSS_ORDER + 1)
+
+
+class AutoStepTest(unittest.TestCase):
+    """Test class for step sizes picked from derivative error bounds"""
+    def test_tolerance_met(self):
+        """the picked step meets the tolerance without being far too small"""
+        polynomial = auc.Polynomial({4:1, 1:-3})
+        exact_area = polynomial.integrate(-2, 2)
+        for name in ("midpoint", "trapezoid", "simpson", "gauss2"):
+            algorithm = auc.get_algorithm(name)
+            step = auc.auto_step(polynomial, -2, 2, algorithm, 1e-6)
+            area = auc.area_under_curve(polynomial, auc.Bounds(-2, 2, step), algorithm)
+            assert abs(area - exact_area) <= 1e-6
+            assert abs(area - exact_area) > 1e-7
+
+    def test_exact_rules(self):
+        """rules that are exact for the polynomial take a single panel"""
+        polynomial = auc.Polynomial({3:1})
+        assert auc.auto_step(polynomial, 0, 10, auc.get_algorithm("simpson"), 1e-9) == 10
+        with self.assertRaises(ValueError):
+            auc.auto_step(auc.Polynomial({2.5:1}), 0, 10, auc.get_algorithm("simpson"))
+
+    def test_tolerance_argument(self):
+        """a tolerance picks the step size for uniform rules"""
+        parsed_params = auc.parse_commandline_arguments(["-p", "{3:1}", "-a", "midpoint",
+                                                         "-t", "1e-4", "-s", ".001"])
+        bounds = parsed_params.bounds
+        assert bounds.step_size > .001
+        area = auc.area_under_curve(parsed_params.polynomial, bounds, parsed_params.algorithm)
+        assert abs(area - 2500) <= 1e-4
+        assert auc.parse_commandline_arguments(["-p", "{2.5:1}", "-a", "simpson",
+                                                "-t", "1e-4"]) is None
+
+
+class CompareTest(unittest.TestCase):
+    """Test class for single pass algorithm comparison"""
+    def test_matches_separate_runs(self):
+        """each estimate matches its own run, and errors are against the exact area"""
+        polynomial = auc.Polynomial({4:1, 1:-3, .5:2})
+        bounds = auc.Bounds(0, 3, .01)
+        for vectorize in (True, False):
+            comparison = auc.compare_algorithms(polynomial, bounds, vectorize)
+            for name, error in comparison.errors().items():
+                area = auc.area_under_curve(polynomial, bounds, auc.get_algorithm(name), vectorize)
+                self.assertAlmostEqual(getattr(comparison, name), area, places=9)
+                self.assertAlmostEqual(error, area - polynomial.integrate(0, 3), places=9)
+
+    def test_simpson_evaluations(self):
+        """the comparison costs as many evaluations as one simpson run"""
+        polynomial = counting_polynomial({3:1})
+        bounds = auc.Bounds(0, 10, .1)
+        comparison = auc.compare_algorithms(polynomial, bounds, vectorize=False)
+        self.assertAlmostEqual(comparison.errors()["simpson"], 0)
+        evaluations = polynomial.stats.evaluations
+        polynomial.stats.evaluations = 0
+        auc.area_under_curve(polynomial, bounds, auc.get_algorithm("simpson"), vectorize=False)
+        assert evaluations == polynomial.stats.evaluations
+
+    def test_partial_grid(self):
+        """errors are against the exact area over the grid, not the requested bounds"""
+        comparison = auc.compare_algorithms(auc.Polynomial({2:1}), auc.Bounds(0, 1, .3))
+        self.assertAlmostEqual(comparison.exact, .9 ** 3 / 3)
+        self.assertAlmostEqual(comparison.errors()["simpson"], 0)
+
+    def test_compare_argument(self):
+        """command line comparison"""
+        assert auc.parse_commandline_arguments(["-p", "{3:1}", "--compare"]).compare
+        with unittest.mock.patch("builtins.print") as print_mock:
+            auc.area_under_curve_argv(["area_under_curve.py", "-p", "{3:1}", "--compare"])
+        lines = [call[0][0] for call in print_mock.call_args_list]
+        assert [line.split(" = ")[0] for line in lines] == [
+            "Total Area (midpoint)", "Total Area (trapezoid)", "Total Area (simpson)",
+            "Exact Area"]
+
+
+class SolverTest(unittest.TestCase):
+    """Test class for the upper bound solver"""
+    def test_solve(self):
+        """the area up to the solution reaches the target"""
+        polynomial = auc.Polynomial({3:1})
+        for name in ("simpson", "gauss", "adaptive", "exact"):
+            upper = auc.solve_upper_bound(polynomial, 0, 2500, auc.get_algorithm(name))
+            self.assertAlmostEqual(upper, 10)
+        polynomial = auc.Polynomial({.5:1, 0:1})
+        algorithm = auc.get_algorithm("trapezoid")
+        upper = auc.solve_upper_bound(polynomial, 2, 50, algorithm, 1e-8, step=.01, guess=100)
+        area = auc.area_under_curve(polynomial, auc.Bounds(2, upper, (upper - 2) / 1000), algorithm)
+        self.assertAlmostEqual(area, 50, places=4)
+
+    def test_unreachable(self):
+        """a target the area never reaches is an error"""
+        with self.assertRaises(ValueError):
+            auc.solve_upper_bound(auc.Polynomial({0:-1}), 0, 5, auc.get_algorithm("exact"))
+        for name in ("trapezoid", "simpson", "gauss", "adaptive"):
+            with self.assertRaises(ValueError):
+                auc.solve_upper_bound(auc.Polynomial({2:1}), 0, -1, auc.get_algorithm(name),
+                                      1e-6)
+        with self.assertRaises(ValueError):
+            auc.solve_upper_bound(auc.Polynomial({3:1, 1:-50}), -10, -1e6,
+                                  auc.get_algorithm("trapezoid"), step=.01)
+        with unittest.mock.patch.object(auc.solver, "MAX_SOLVER_PANELS", 10000):
+            with self.assertRaises(ValueError):
+                auc.solve_upper_bound(auc.Polynomial({2:1}), 0, 1e30,
+                                      auc.get_algorithm("midpoint"), step=.01)
+
+    def test_sign_bound(self):
+        """the polynomial keeps the sign of its leading coefficient above the bound"""
+        assert auc.sign_bound(auc.Polynomial({2:-3})) == (0.0, -1)
+        bound, sign = auc.sign_bound(auc.Polynomial({3:1, 2:-4, 0:-5}))
+        assert sign == 1 and bound == 9
+        assert auc.Polynomial({3:1, 2:-4, 0:-5}).evaluate(4) < 0
+
+    def test_target_argument(self):
+        """command line target"""
+        parsed_params = auc.parse_commandline_arguments(["-p", "{3:1}", "--target", "2500"])
+        assert parsed_params.target_area == 2500
+        with unittest.mock.patch("builtins.print") as print_mock:
+            auc.area_under_curve_argv(["area_under_curve.py", "-p", "{3:1}", "-a", "simpson",
+                                       "--target", "2500", "-u", "3"])
+        output = print_mock.call_args[0][0]
+        assert output.startswith("Upper Bound (simpson) = ")
+        self.assertAlmostEqual(float(output.split("= ")[1]), 10)
+
+
+class ExactTest(unittest.TestCase):
+    """Test class for closed-form integration"""
+    def test_antiderivative(self):
+        """antiderivative of 3x^2 + 4x + 5 is x^3 + 2x^2 + 5x"""
+        antiderivative = auc.Polynomial({2:3, 1:4, 0:5}).antiderivative()
+        assert antiderivative.coefficient_dict == {3:1, 2:2, 1:5}
+
+    def test_integrate_fractional(self):
+        """integral of x^.5 over [0-10]"""
+        area = auc.Polynomial({.5:1}).integrate(0, 10)
+        self.assertAlmostEqual(area, 10 * math.sqrt(10) / 1.5)
+
+    def test_integrate_fraction_reject(self):
+        """reject negative bounds with fractional exponents"""
+        with self.assertRaises(ValueError):
+            auc.Polynomial({1.5:1}).integrate(-1, 1)
+
+    def test_exact_algorithm(self):
+        """exact algorithm ignores the step size"""
+        algorithm = auc.get_algorithm("exact")
+        area = auc.area_under_curve(auc.Polynomial({3:1}), auc.Bounds(0, 10, 3), algorithm)
+        assert area == 2500
+
+    def test_exact_argument(self):
+        """parse exact flag"""
+        parsed_params = auc.parse_commandline_arguments(["-p", "{3:2}", "--exact"])
+        assert parsed_params.report_exact
+
+class BatchTest(unittest.TestCase):
+    """Test class for batch integration"""
+    def test_batch_matches_single(self):
+        """batch areas match single calls and keep input order"""
+        bounds_1 = auc.Bounds(0, 10, .1)
+        bounds_2 = auc.Bounds(-2, 3, .05)
+        polynomials = [auc.Polynomial({3:1}), auc.Polynomial({2:3, 1:4, 0:5}),
+                       auc.Polynomial({.5:2, 2:1})]
+        jobs = [(auc.Polynomial({1000:1, 999:3, 0:2}), auc.Bounds(0, 1, .01),
+                 auc.get_algorithm("trapezoid"))]
+        for name in ("midpoint", "trapezoid", "simpson", "adaptive", "exact"):
+            algorithm = auc.get_algorithm(name)
+            jobs += [(polynomial, bounds_1, algorithm) for polynomial in polynomials]
+            jobs += [(polynomial, bounds_2, algorithm) for polynomial in polynomials[:2]]
+        areas = auc.area_under_curve_batch(jobs)
+        for job, area in zip(jobs, areas):
+            expected = auc.area_under_curve(*job, vectorize=False)
+            self.assertAlmostEqual(area, expected)
+
+    def test_batch_far_from_origin(self):
+        """shared nodes away from 0 keep the precision of single calls"""
+        shifted = auc.Polynomial({1:1, 0:-10})
+        squared = shifted * shifted
+        polynomial = squared * squared * squared * squared
+        bounds = auc.Bounds(9, 11, .01)
+        algorithm = auc.get_algorithm("simpson")
+        expected = auc.area_under_curve(polynomial, bounds, algorithm)
+        area = auc.area_under_curve_batch([(polynomial, bounds, algorithm),
+                                           (auc.Polynomial({2:1}), bounds, algorithm)])[0]
+        assert abs(area - expected) < 1e-7
+
+    def test_batch_parameters(self):
+        """batch accepts Parameters objects"""
+        params = auc.Parameters.factory({2:1}, 0, 3, .1, auc.get_algorithm("simpson"))
+        self.assertAlmostEqual(auc.area_under_curve_batch([params])[0], 9)
+
+    def test_batch_fraction_reject(self):
+        """reject negative bounds with fractional exponents"""
+        with self.assertRaises(ValueError):
+            auc.area_under_curve_batch([(auc.Polynomial({1.5:1}), auc.Bounds(-1, 1, .1),
+                                         auc.get_algorithm("trapezoid"))])
+
+class ParallelTest(unittest.TestCase):
+    """Test class for process-pool integration"""
+    def test_parallel_reproducible(self):
+        """every worker count gives the same answer"""
+        bounds = auc.Bounds(0, 2, 1e-5)
+        polynomial = auc.Polynomial({4:1, 1:-3})
+        algorithm = auc.get_algorithm("simpson")
+        areas = {auc.area_under_curve(polynomial, bounds, algorithm, workers=workers)
+                 for workers in (1, 2, 3)}
+        assert len(areas) == 1
+        self.assertAlmostEqual(areas.pop(), 32 / 5 - 6)
+
+    def test_parallel_pure_python(self):
+        """pure-python blocks match the serial composite rule"""
+        bounds = auc.Bounds(0, 1, 5e-6)
+        polynomial = auc.Polynomial({.5:1})
+        algorithm = auc.get_algorithm("trapezoid")
+        serial = auc.area_under_curve(polynomial, bounds, algorithm, vectorize=False)
+        parallel = auc.area_under_curve(polynomial, bounds, algorithm, vectorize=False, workers=2)
+        self.assertAlmostEqual(serial, parallel, places=10)
+
+    def test_workers_argument(self):
+        """parse workers argument"""
+        parsed_params = auc.parse_commandline_arguments(["-p", "{3:2}", "--workers", "4"])
+        assert parsed_params.workers == 4
+        assert auc.parse_commandline_arguments(["-p", "{3:2}", "-w", "0"]) is None
+        assert auc.parse_commandline_arguments(["-p", "{3:2}", "-w", "1.5"]) is None
+
+class ProgressiveTest(unittest.TestCase):
+    """Test class for progressive integration"""
+    def test_progressive_final(self):
+        """the last report covers the whole grid"""
+        bounds = auc.Bounds(0, 10, .01)
+        polynomial = auc.Polynomial({3:1, .5:2})
+        algorithm = auc.get_algorithm("simpson")
+        reports = list(auc.area_under_curve_progressive(polynomial, bounds, algorithm,
+                                                        interval=100))
+        assert len(reports) == 10
+        assert [report.fraction for report in reports][-1] == 1
+        self.assertAlmostEqual(reports[-1].area, auc.area_under_curve(polynomial, bounds,
+                                                                      algorithm))
+        assert reports[-1].estimate == reports[-1].area
+
+    def test_progressive_lazy(self):
+        """panels after the last report read are never evaluated"""
+        polynomial = counting_polynomial({2:1})
+        reports = auc.area_under_curve_progressive(polynomial, auc.Bounds(0, 10, .1),
+                                                   auc.get_algorithm("trapezoid"),
+                                                   interval=10, vectorize=False)
+        report = next(reports)
+        assert report.fraction == .1
+        self.assertAlmostEqual(report.estimate, 1000 / 3, places=2)
+        assert polynomial.stats.evaluations == 11 + auc.DEFAULT_GAUSS_ORDER
+
+    def test_progressive_early_stop(self):
+        """stop at the tolerance or the deadline"""
+        bounds = auc.Bounds(0, 10, .01)
+        polynomial = auc.Polynomial({3:1})
+        algorithm = auc.get_algorithm("midpoint")
+        reports = list(auc.area_under_curve_progressive(polynomial, bounds, algorithm,
+                                                        interval=100, tolerance=.1))
+        assert len(reports) == 2
+        reports = list(auc.area_under_curve_progressive(polynomial, bounds, algorithm,
+                                                        interval=100, deadline=0))
+        assert len(reports) == 1
+
+
+class CacheTest(unittest.TestCase):
+    """Test class for the result caches"""
+    def test_cache_key_canonical(self):
+        """key ignores coefficient order, zero terms, and int/float spelling"""
+        algorithm = auc.get_algorithm("simpson")
+        key_1 = auc.cache_key(auc.Polynomial({2:1, 0:3}), auc.Bounds(0, 1, .1), algorithm)
+        key_2 = auc.cache_key(auc.Polynomial({0:3.0, 1:0, 2:1}), auc.Bounds(0.0, 1.0, .1),
+                              algorithm)
+        key_3 = auc.cache_key(auc.Polynomial({2:1, 0:3}), auc.Bounds(0, 1, .1),
+                              auc.get_algorithm("trapezoid"))
+        assert key_1 == key_2
+        assert key_1 != key_3
+
+    def test_result_cache(self):
+        """area_under_curve hits the LRU for repeated queries"""
+        cache = auc.ResultCache(max_size=2)
+        polynomial = counting_polynomial({2:1})
+        algorithm = auc.get_algorithm("trapezoid")
+        for _ in range(3):
+            auc.area_under_curve(polynomial, auc.Bounds(0, 1, .1), algorithm,
+                                 vectorize=False, cache=cache)
+        assert polynomial.stats.evaluations == 11
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_cache_key_algorithm(self):
+        """algorithms with the same __name__ get different keys"""
+        bounds = auc.Bounds(0, 10, 1)
+        left = auc.register_algorithm("left")(lambda poly, lower, upper: poly.evaluate(lower))
+        right = auc.register_algorithm("right")(lambda poly, lower, upper: poly.evaluate(upper))
+        try:
+            cache = auc.ResultCache()
+            polynomial = auc.Polynomial({1:1})
+            assert auc.area_under_curve(polynomial, bounds, left, cache=cache) == 45
+            assert auc.area_under_curve(polynomial, bounds, right, cache=cache) == 55
+        finally:
+            del auc.ALGORITHMS["left"], auc.ALGORITHMS["right"]
+        assert auc.algorithm_key(auc.get_algorithm("unit_test:left_rectangle")) == \
+            "unit_test:left_rectangle"
+        assert auc.algorithm_key(auc.get_algorithm("gauss5")) == \
+            auc.algorithm_key(auc.get_algorithm("gauss"))
+
+    def test_cache_domain(self):
+        """a cached integer polynomial doesn't answer for its fractional spelling"""
+        cache = auc.ResultCache()
+        bounds = auc.Bounds(-1, 1, .1)
+        algorithm = auc.get_algorithm("simpson")
+        auc.area_under_curve(auc.Polynomial({2:1}), bounds, algorithm, cache=cache)
+        with self.assertRaises(ValueError):
+            auc.area_under_curve(auc.Polynomial({2.0:1}), bounds, algorithm, cache=cache)
+        assert auc.Polynomial({1:1}) != auc.Polynomial({1.0:1})
+
+    def test_result_cache_eviction(self):
+        """least recently used entries are evicted first"""
+        cache = auc.ResultCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    def test_disk_cache(self):
+        """sqlite cache persists across connections and evicts past max_size"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite")
+            cache = auc.DiskCache(path, max_size=2)
+            cache.put("a", 1.5)
+            cache.put("b", 2.5)
+            cache.put("c", 3.5)
+            cache.close()
+            cache = auc.DiskCache(path, max_size=2)
+            assert len(cache) == 2
+            assert cache.get("a") is None
+            assert cache.get("c") == 3.5
+            assert (cache.hits, cache.misses) == (1, 1)
+            cache.close()
+
+    def test_entrypoint_disk_cache(self):
+        """command line stores results in the disk cache"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite")
+            args = ["area_under_curve.py", "-p", "{3:1}", "-s", ".1", "--cache", path]
+            auc.area_under_curve_argv(args)
+            auc.area_under_curve_argv(args)
+            cache = auc.DiskCache(path)
+            assert len(cache) == 1
+            cache.close()
+
+class StatsTest(unittest.TestCase):
+    """Test class for instrumentation and logging"""
+    def test_stats_counts(self):
+        """count evaluations and panels, and call the hook for the integration phase"""
+        phases = []
+        stats = auc.IntegrationStats(hook=lambda phase, seconds, stats: phases.append(phase))
+        algorithm = auc.get_algorithm("simpson")
+        auc.area_under_curve(auc.Polynomial({2:1}), auc.Bounds(0, 10, 1), algorithm,
+                             vectorize=False, stats=stats)
+        assert stats.panels == 10
+        assert stats.evaluations == 21
+        assert stats.integration_seconds > 0
+        assert phases == ["integration"]
+
+    def test_stats_cache_hit(self):
+        """cache hits don't evaluate the polynomial"""
+        cache = auc.ResultCache()
+        algorithm = auc.get_algorithm("trapezoid")
+        for _ in range(2):
+            stats = auc.IntegrationStats()
+            auc.area_under_curve(auc.Polynomial({2:1}), auc.Bounds(0, 10, 1), algorithm,
+                                 vectorize=False, cache=cache, stats=stats)
+        assert stats.evaluations == 0
+
+    def test_logging_quiet(self):
+        """the library leaves the root logger alone and formats messages lazily"""
+        assert auc.LOGGER is not auc.logging.getLogger()
+        polynomial = auc.Polynomial({2:1})
+        previous_level = auc.LOGGER.level
+        auc.LOGGER.setLevel(auc.logging.WARNING)
+        try:
+            with unittest.mock.patch.object(auc.Polynomial, "__str__") as to_string:
+                auc.area_under_curve(polynomial, auc.Bounds(0, 1, .5),
+                                     auc.get_algorithm("midpoint"))
+                to_string.assert_not_called()
+        finally:
+            auc.LOGGER.setLevel(previous_level)
+
+class FractionalTest(unittest.TestCase):
+    """Test class for fractional exponent evaluation"""
+    POLYNOMIALS = [{.5:1, 1.5:2, 2.5:1, 0:3}, {1/3:1, 5/3:2}, {.25:1, 2.75:1}, {1/6:2, 7/6:1},
+                   {.37:1, 1.1:2, 0:3}]
+    VALUES = [0, .3, 2, 9.5]
+
+    def test_evaluate(self):
+        """root chains and shared logs match term by term powers, zero included"""
+        for coefficients in self.POLYNOMIALS:
+            polynomial = auc.Polynomial(coefficients)
+            for value in self.VALUES:
+                expected = sum(coefficient * value ** degree
+                               for degree, coefficient in coefficients.items())
+                self.assertAlmostEqual(polynomial.evaluate(value), expected, places=12)
+            with self.assertRaises(ValueError):
+                polynomial.evaluate(-1)
+
+    @unittest.skipIf(auc.numpy is None, "numpy not installed")
+    def test_evaluate_array(self):
+        """batched evaluation matches scalar evaluation and rejects negative inputs"""
+        for coefficients in self.POLYNOMIALS:
+            polynomial = auc.Polynomial(coefficients)
+            values = polynomial.evaluate_array(auc.numpy.array(self.VALUES, dtype=float))
+            for value, expected in zip(values, map(polynomial.evaluate, self.VALUES)):
+                self.assertAlmostEqual(value, expected, places=12)
+            with self.assertRaises(ValueError):
+                polynomial.evaluate_array(auc.numpy.array([1.0, -1.0]))
+
+    def test_check_domain(self):
+        """negative bounds are rejected before any evaluation"""
+        polynomial = counting_polynomial({.5:1})
+        with self.assertRaises(ValueError):
+            auc.area_under_curve(polynomial, auc.Bounds(-1, 1, .1), auc.get_algorithm("simpson"))
+        assert polynomial.stats.evaluations == 0
+
+
+def left_rectangle(poly, lower, upper):
+    """Left rectangle rule, used as a user-defined algorithm"""
+    return (upper - lower) * poly.evaluate(lower)
+
+
+class RegistryTest(unittest.TestCase):
+    """Test class for the algorithm registry"""
+    def tearDown(self):
+        auc.ALGORITHMS.pop("left", None)
+        auc.ALGORITHMS.pop("left_weights", None)
+
+    def test_builtin_metadata(self):
+        """built-in algorithms declare their metadata"""
+        assert auc.list_algorithms() == ["adaptive", "exact", "gauss", "midpoint", "romberg",
+                                         "simpson", "trapezoid"]
+        simpson = auc.get_algorithm("simpson")
+        assert (simpson.points_per_panel, simpson.shares_nodes, simpson.exact_degree) == \
+            (3, True, 3)
+        assert auc.get_algorithm("gauss4").exact_degree == 7
+
+    def test_register_panel_rule(self):
+        """user rules with only a per-panel function work from the command line"""
+        auc.register_algorithm("left", points_per_panel=1)(left_rectangle)
+        algorithm = auc.get_algorithm("left")
+        area = auc.area_under_curve(auc.Polynomial({1:1}), auc.Bounds(0, 10, 1), algorithm)
+        assert area == 45
+        parsed_params = auc.parse_commandline_arguments(["-p", "{1:1}", "-a", "left"])
+        assert parsed_params.algorithm is left_rectangle
+        auc.area_under_curve_argv(["area_under_curve.py", "-p", "{1:1}", "-a", "left"])
+
+    @unittest.skipIf(auc.numpy is None, "numpy not installed")
+    def test_register_weights_rule(self):
+        """user rules with node/weight arrays are vectorized"""
+        def left_weights(points):
+            return points[:-1].to_array(), auc.numpy.full(len(points) - 1, points.step)
+        def left_weighted(poly, lower, upper):
+            return left_rectangle(poly, lower, upper)
+        rule = auc.register_algorithm("left_weights", weights=left_weights)(left_weighted)
+        area = auc.area_under_curve(auc.Polynomial({1:1}), auc.Bounds(0, 10, 1), rule)
+        assert area == 45
+
+    def test_import_rule(self):
+        """module:function imports an algorithm"""
+        algorithm = auc.get_algorithm("unit_test:left_rectangle")
+        assert algorithm.__name__ == "left_rectangle"
+        assert auc.get_algorithm("no_such_module:rule") is None
+
+    def test_register_unknown_property(self):
+        """reject unknown properties"""
+        with self.assertRaises(ValueError):
+            auc.register_algorithm("left", kernal=None)
+
 
 class EntryPointTest(unittest.TestCase):
     """Test main entrypoint"""
@@ -238,6 +971,21 @@ class EntryPointTest(unittest.TestCase):
         auc.area_under_curve_argv(["area_under_curve.py", "-p", "{3:1}", "-l", "0",
                                    "-u", "10", "-s", ".1", "-a", "simpson"])
 
+    def test_entrypoint_adaptive(self):
+        """test adaptive command line"""
+        auc.area_under_curve_argv(["area_under_curve.py", "-p", "{.5:1}", "-a", "adaptive",
+                                   "--tolerance", "1e-6"])
+
+    def test_entrypoint_exact(self):
+        """test command line with exact area report"""
+        auc.area_under_curve_argv(["area_under_curve.py", "-p", "{3:1}", "-s", ".1",
+                                   "-a", "midpoint", "-e"])
+        with unittest.mock.patch("builtins.print") as print_mock:
+            auc.area_under_curve_argv(["area_under_curve.py", "-p", "{2:1}", "-l", "0",
+                                       "-u", "1", "-s", ".3", "-a", "simpson", "-e"])
+        error = float(print_mock.call_args_list[-1][0][0].split("error = ")[1])
+        self.assertAlmostEqual(error, 0)
+
     def test_entrypoint_invalid(self):
         """reject invalid command line"""
         with self.assertRaises(SystemExit):